@@ -0,0 +1,111 @@
+import functools
+import threading
+from collections import OrderedDict
+
+from backend import instrumentation
+
+_MISSING = object()
+
+
+def _freeze(value):
+    """Turn query arguments (dicts, lists) into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class QueryCache:
+    """
+    LRU cache of query results tied to a table version.
+
+    Every entry belongs to the version that was current when it was loaded;
+    as soon as the version moves on, all entries are dropped. Writers bump the
+    version, so a cached result is never served after a committed change.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, version_func, loader):
+        """Return the cached value for `key`, calling `loader` on a miss."""
+        version = version_func()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = loader()
+
+        with self._lock:
+            # Skip storing if a write landed while the query was running
+            if self.max_entries > 0 and version_func() == self._version == version:
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def resize(self, max_entries):
+        """Change the entry bound; 0 disables caching."""
+        with self._lock:
+            self.max_entries = max_entries
+            while len(self._entries) > max(max_entries, 0):
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+def cached_query(cache, version_func):
+    """
+    Decorator making a read function read-through `cache`. List results are
+    stored as tuples and handed out as fresh lists, so callers can't alter
+    what other callers get.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, _freeze(args), _freeze(kwargs))
+
+            loaded = False
+
+            def load():
+                nonlocal loaded
+                loaded = True
+                result = func(*args, **kwargs)
+                return tuple(result) if isinstance(result, list) else result
+
+            result = cache.get_or_load(key, version_func, load)
+            instrumentation.note_cache_lookup(hit=not loaded)
+            return list(result) if type(result) is tuple else result
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
@@ -0,0 +1,104 @@
+"""
+Change feed over the shared tasks.db.
+
+Triggers append every committed insert, update and delete on tasks to the
+task_changes log, whichever process or connection made it (see
+CHANGE_LOG_DDL in backend.database). A ChangeFeed keeps one dedicated
+connection open and polls `PRAGMA data_version`. That value changes only
+when another connection has committed, so an idle poll never reads a table.
+When it has changed, the feed reads the log entries after the last sequence
+number it saw and returns the current state of just those tasks.
+"""
+
+from collections import namedtuple
+
+from sqlalchemy import func, select
+
+from backend import database
+from backend.models import Task, TaskChange
+
+# Beyond this many changed tasks a full reload is cheaper than a delta
+MAX_DELTA_TASKS = 2000
+
+# `updated`: TaskRecords of inserted/changed tasks; `deleted`: ids of removed
+# tasks. `reset` means the delta could not be computed and readers should
+# reload everything.
+TaskChanges = namedtuple("TaskChanges", ["seq", "updated", "deleted", "reset"])
+
+
+class ChangeFeed:
+    """Pulls task changes committed by any connection since the last pull."""
+
+    def __init__(self, engine=None):
+        self.engine = engine or database.engine
+        self.connection = None
+
+    def open(self):
+        """
+        Connect and take the current position; only changes made after this
+        are reported. Done by the first check if not called beforehand.
+        """
+        if self.connection is not None:
+            return
+        self.connection = self.engine.connect()
+        with self.connection.begin():
+            self.data_version = self._data_version()
+            latest = self.connection.execute(select(func.max(TaskChange.seq))).scalar()
+        self.seq = latest or 0
+
+    def _data_version(self):
+        return self.connection.exec_driver_sql("PRAGMA data_version").scalar()
+
+    def check(self):
+        """True if another connection committed since the last check."""
+        self.open()
+        with self.connection.begin():
+            version = self._data_version()
+        if version == self.data_version:
+            return False
+        self.data_version = version
+        return True
+
+    def pull(self):
+        """Return the TaskChanges logged since the last pull, or None."""
+        self.open()
+        with self.connection.begin():
+            first, last = self.connection.execute(
+                select(func.min(TaskChange.seq), func.max(TaskChange.seq))
+            ).one()
+            if last is None or last <= self.seq:
+                return None
+
+            changed_ids = (
+                select(TaskChange.task_id)
+                .where(TaskChange.seq > self.seq, TaskChange.seq <= last)
+                .distinct()
+            )
+            reset = first > self.seq + 1  # Pruned past what we saw: deltas lost
+            if not reset:
+                ids = set(self.connection.scalars(changed_ids))
+                reset = len(ids) > MAX_DELTA_TASKS
+            if not reset:
+                updated = list(
+                    map(
+                        database.TaskRecord._make,
+                        self.connection.execute(
+                            database.select_records().where(Task.id.in_(changed_ids))
+                        ),
+                    )
+                )
+
+        self.seq = last
+        database.note_external_change()
+        if reset:
+            return TaskChanges(last, [], [], True)
+        deleted = ids.difference(task.id for task in updated)
+        return TaskChanges(last, updated, sorted(deleted), False)
+
+    def poll(self):
+        """`pull()` if anything was committed since the last poll, else None."""
+        return self.pull() if self.check() else None
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
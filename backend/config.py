@@ -0,0 +1,120 @@
+"""
+Storage configuration: which database the backend opens, and how.
+
+Settings come from the environment, so the GUI, the CLI, the server and the
+benchmarks can all be pointed elsewhere without code changes:
+
+- TODO_STORAGE: "sqlite" (default) opens TODO_DATABASE_URL with the tuned
+  settings below. "sqlite-defaults" opens the same file with SQLite's stock
+  settings, for comparison. "memory" opens a private in-memory database
+  that starts empty and goes away with the process, for tests
+  (tests/conftest.py) and benchmarks.
+- TODO_DATABASE_URL: defaults to sqlite:///tasks.db, in the working directory.
+- TODO_SQLITE_SYNCHRONOUS, TODO_SQLITE_CACHE_MB, TODO_SQLITE_MMAP_MB and
+  TODO_DB_POOL_SIZE override the individual tunings.
+"""
+
+import os
+import sqlite3
+import uuid
+from collections import namedtuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+SQLITE = "sqlite"
+SQLITE_DEFAULTS = "sqlite-defaults"
+MEMORY = "memory"
+STORAGE_MODES = (SQLITE, SQLITE_DEFAULTS, MEMORY)
+
+DEFAULT_DATABASE_URL = "sqlite:///tasks.db"
+
+# One open connection per in-memory database, which lives only while it does
+_memory_databases = []
+
+StorageConfig = namedtuple(
+    "StorageConfig",
+    [
+        "storage",
+        "database_url",
+        "synchronous",  # NORMAL is durable in WAL mode except across power loss
+        "cache_mb",  # Page cache per connection
+        "mmap_mb",  # Read the file through a memory map instead of read()
+        "pool_size",  # Connections kept open: one per thread that queries
+        "cached_statements",  # Prepared statements kept per connection
+    ],
+)
+
+
+def load_config(environ=os.environ):
+    """Build the StorageConfig described by the environment."""
+    storage = environ.get("TODO_STORAGE", SQLITE)
+    if storage not in STORAGE_MODES:
+        raise ValueError(
+            f"TODO_STORAGE must be one of {', '.join(STORAGE_MODES)}, not {storage!r}"
+        )
+    return StorageConfig(
+        storage=storage,
+        database_url=environ.get("TODO_DATABASE_URL", DEFAULT_DATABASE_URL),
+        synchronous=environ.get("TODO_SQLITE_SYNCHRONOUS", "NORMAL").upper(),
+        cache_mb=int(environ.get("TODO_SQLITE_CACHE_MB", 32)),
+        mmap_mb=int(environ.get("TODO_SQLITE_MMAP_MB", 256)),
+        pool_size=int(environ.get("TODO_DB_POOL_SIZE", 8)),
+        cached_statements=256,
+    )
+
+
+def _tune_connection(config):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # Readers no longer block the writer, and commits append to the WAL
+        # instead of rewriting pages, so synchronous=NORMAL is safe
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={config.synchronous}")
+        cursor.execute(f"PRAGMA cache_size=-{config.cache_mb * 1024}")  # In KiB
+        cursor.execute(f"PRAGMA mmap_size={config.mmap_mb * 1024 * 1024}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return on_connect
+
+
+def create_storage_engine(config=None):
+    """Create the SQLAlchemy engine for `config` (default: `load_config()`)."""
+    config = config or load_config()
+    if config.storage == MEMORY:
+        # A named database on SQLite's memdb VFS: unlike "sqlite://", every
+        # pooled connection opens the same one, and they lock it like a file,
+        # so threads wait their turn instead of sharing one connection
+        name = f"file:/todo-{uuid.uuid4().hex}?vfs=memdb"
+        _memory_databases.append(
+            sqlite3.connect(name, uri=True, check_same_thread=False)
+        )
+        return create_engine(
+            f"sqlite:///{name}&uri=true",
+            poolclass=QueuePool,
+            pool_size=config.pool_size,
+            max_overflow=config.pool_size,
+            connect_args={"check_same_thread": False},
+        )
+
+    if config.storage == SQLITE_DEFAULTS:
+        return create_engine(
+            config.database_url, connect_args={"check_same_thread": False}
+        )
+
+    engine = create_engine(
+        config.database_url,
+        # Every thread that queries (GUI worker, write-behind, change feed,
+        # server executor) keeps a warm connection with its own page cache
+        # and statement cache instead of reopening the file
+        poolclass=QueuePool,
+        pool_size=config.pool_size,
+        max_overflow=config.pool_size,
+        connect_args={
+            "check_same_thread": False,
+            "cached_statements": config.cached_statements,
+        },
+    )
+    event.listen(engine, "connect", _tune_connection(config))
+    return engine
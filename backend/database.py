@@ -1,31 +1,190 @@
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime
-from sqlalchemy.ext.declarative import declarative_base
+import atexit
+import heapq
+import re
+import threading
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    MetaData,
+    Table,
+    bindparam,
+    case,
+    delete,
+    event,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, scoped_session
 
-# Database Setup
-DATABASE_URL = "sqlite:///tasks.db"
+from backend import config, instrumentation, migrations
+from backend.cache import QueryCache, cached_query
+from backend.instrumentation import instrumented
+from backend.models import ArchivedTask, Base, Task, task_hash, to_deadline
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Database Setup: which database and how it is tuned come from the
+# environment (TODO_STORAGE, TODO_DATABASE_URL; see backend/config.py)
+storage_config = config.load_config()
+engine = config.create_storage_engine(storage_config)
+DATABASE_URL = engine.url.render_as_string()
+# Latency histograms, off unless TODO_INSTRUMENT=1 (see backend/instrumentation.py)
+instrumentation.enable_from_environment(engine)
 SessionLocal = scoped_session(
     sessionmaker(autocommit=False, autoflush=False, bind=engine)
 )
 
-Base = declarative_base()
+# Columns that get_tasks_page accepts in `order_by`
+SORTABLE_COLUMNS = {
+    "id": Task.id,
+    "title": Task.title,
+    "priority": Task.priority,
+    "completed": Task.completed,
+    "deadline": Task.deadline,
+    "completed_at": Task.completed_at,
+}
+
+# FTS5 index over task titles. It lives outside Base.metadata because
+# create_all cannot emit virtual tables; _create_search_index sets it up.
+search_index = Table(
+    "tasks_fts",
+    MetaData(),
+    Column("rowid", Integer),
+    Column("title", String),
+    Column("rank"),
+)
+
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, content='tasks', content_rowid='id', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title)
+        VALUES ('delete', old.id, old.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title ON tasks
+    BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title)
+        VALUES ('delete', old.id, old.title);
+        INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+    END""",
+]
+
+# Every committed change to tasks is appended to task_changes, whichever
+# process made it, so other instances can pull just the delta (see
+# backend/changes.py). Only the newest CHANGE_LOG_SIZE entries are kept.
+CHANGE_LOG_SIZE = 10_000
+
+CHANGE_LOG_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS tasks_log_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_changes(task_id, op) VALUES (new.id, 'insert');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_log_update AFTER UPDATE ON tasks BEGIN
+        INSERT INTO task_changes(task_id, op) VALUES (new.id, 'update');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_log_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO task_changes(task_id, op) VALUES (old.id, 'delete');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_changes_prune AFTER INSERT ON task_changes
+    BEGIN
+        DELETE FROM task_changes WHERE seq <= new.seq - {CHANGE_LOG_SIZE};
+    END""",
+]
+
+# SQLite limits bound parameters per statement, so id lists are sent in chunks
+MAX_IDS_PER_STATEMENT = 500
+
+PRIORITIES = (1, 2, 3)  # Low, Medium, High
+
 
+def _create_search_index():
+    """
+    Create the FTS5 title index and its sync triggers if missing, populating it
+    from existing rows. Returns False when SQLite was built without FTS5.
+    """
+    with engine.begin() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'")
+        ).first()
+        try:
+            if not exists:
+                connection.execute(text(SEARCH_INDEX_DDL[0]))
+                connection.execute(
+                    text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+                )
+            for statement in SEARCH_INDEX_DDL[1:]:
+                connection.execute(text(statement))
+        except OperationalError:
+            return False
+    return True
 
-# Task Model
-class Task(Base):
-    __tablename__ = "tasks"
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, nullable=False)
-    priority = Column(Integer, default=1)
-    completed = Column(Boolean, default=False)
-    deadline = Column(String, nullable=True)  # Add this line
+# False when SQLite lacks FTS5; set by init_db, read via search_index_available()
+SEARCH_INDEX_AVAILABLE = None
 
+_schema_ready = False
+_schema_lock = threading.Lock()
+_schema_owner = None  # Thread running init_db, whose own connections pass through
 
-# Ensure tables exist
-Base.metadata.create_all(bind=engine)
+
+def init_db():
+    """
+    Migrate the database and create whatever is missing. Runs once, when the
+    first connection is made rather than at import, so importing this module
+    (e.g. to show a snapshot at startup) never touches the database file.
+    """
+    global _schema_ready, _schema_owner, SEARCH_INDEX_AVAILABLE
+    if _schema_ready or _schema_owner == threading.get_ident():
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        _schema_owner = threading.get_ident()
+        try:
+            # Upgrade files written by older versions, then create anything missing
+            migrations.migrate(engine)
+            Base.metadata.create_all(bind=engine)
+
+            # create_all skips tables that already exist, so add any indexes
+            # missing from databases created before they were declared
+            for index in (*Task.__table__.indexes, *ArchivedTask.__table__.indexes):
+                index.create(bind=engine, checkfirst=True)
+
+            SEARCH_INDEX_AVAILABLE = _create_search_index()
+
+            with engine.begin() as connection:
+                for statement in CHANGE_LOG_DDL:
+                    connection.execute(text(statement))
+            _schema_ready = True
+        finally:
+            _schema_owner = None
+
+
+@event.listens_for(engine, "engine_connect")
+def _init_on_connect(connection):
+    init_db()
+
+
+def search_index_available():
+    init_db()
+    return SEARCH_INDEX_AVAILABLE
 
 
 # Database Functions
@@ -38,42 +197,795 @@ def get_db():
         db.close()
 
 
+# Incremented after every write committed through this module, so readers
+# can tell whether tasks changed (e.g. for HTTP ETags) without a query
+_table_version = 0
+_table_version_lock = threading.Lock()
+
+
+def get_table_version():
+    """Return a number that increases whenever a write to tasks is committed"""
+    return _table_version
+
+
+def _bump_table_version():
+    global _table_version
+    with _table_version_lock:
+        _table_version += 1
+    query_cache.invalidate()
+
+
+def note_external_change():
+    """Record that tasks were changed outside this module, e.g. by another process."""
+    _bump_table_version()
+
+
+# Read functions below are served from this cache until the next write.
+# Resize with `query_cache.resize(n)`; 0 turns caching off.
+QUERY_CACHE_SIZE = 128
+query_cache = QueryCache(QUERY_CACHE_SIZE)
+_cached = cached_query(query_cache, get_table_version)
+
+
+# Read-only snapshot of a task row. Read functions return these instead of
+# ORM objects: they are built straight from Core result rows, skipping the
+# identity map and attribute instrumentation. See README "Read path".
+TaskRecord = namedtuple(
+    "TaskRecord", ["id", "title", "priority", "completed", "deadline", "completed_at"]
+)
+
+TASK_COLUMNS = tuple(getattr(Task, field) for field in TaskRecord._fields)
+ARCHIVE_COLUMNS = tuple(getattr(ArchivedTask, field) for field in TaskRecord._fields)
+
+
+def select_records():
+    """A Core SELECT of the TaskRecord columns, to refine with where/order_by."""
+    return select(*TASK_COLUMNS)
+
+
+def fetch_records(statement):
+    """Execute a `select_records()` statement and return TaskRecords."""
+    with engine.connect() as connection:
+        return list(map(TaskRecord._make, connection.execute(statement)))
+
+
+def _to_record(task):
+    return TaskRecord._make(getattr(task, field) for field in TaskRecord._fields)
+
+
+def _task_source(filters):
+    """
+    The table a query over `filters` reads: just the live tasks, or live and
+    archived tasks together when `filters` has `include_archived` set.
+    """
+    if (filters or {}).get("include_archived"):
+        return union_all(select(*TASK_COLUMNS), select(*ARCHIVE_COLUMNS)).subquery(
+            "all_tasks"
+        )
+    return Task.__table__
+
+
+def _write(operation, *args):
+    """Run one write operation in its own transaction and return its result"""
+    with SessionLocal() as db:
+        result = operation(db, *args)
+        db.commit()
+    _bump_table_version()
+    return result
+
+
+def _insert_tasks(db, rows):
+    """
+    Insert `rows` (see `_task_rows`) as new tasks and return their TaskRecords
+    in the same order. A row whose title and deadline match a live task, or
+    an earlier row, is still added: like the duplicates migration 3 kept, it
+    gets its id mixed into content_hash. Only merge_tasks merges by content.
+    """
+    table = Task.__table__
+    for row in rows:
+        row["content_hash"] = task_hash(row["title"], row["deadline"])
+    # Find the duplicates up front, so each row uses up exactly one id
+    taken = set()
+    for chunk in _chunks({row["content_hash"] for row in rows}):
+        taken.update(
+            db.scalars(
+                select(table.c.content_hash).where(table.c.content_hash.in_(chunk))
+            )
+        )
+    duplicates = []
+    for index, row in enumerate(rows):
+        if row["content_hash"] in taken:
+            # Inserted under a unique placeholder, then salted with the new id
+            row["content_hash"] = uuid.uuid4().hex
+            duplicates.append(index)
+        else:
+            taken.add(row["content_hash"])
+
+    records = [
+        TaskRecord._make(record)
+        for record in db.execute(
+            insert(table).returning(*TASK_COLUMNS, sort_by_parameter_order=True),
+            rows,
+        )
+    ]
+    if duplicates:
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("task_id"))
+            .values(content_hash=bindparam("digest")),
+            [
+                {
+                    "task_id": task.id,
+                    "digest": task_hash(task.title, task.deadline, salt=task.id),
+                }
+                for task in map(records.__getitem__, duplicates)
+            ],
+        )
+    return records
+
+
+def _add_task(db, title, priority, deadline=None):
+    rows = _task_rows([{"title": title, "priority": priority, "deadline": deadline}])
+    return _insert_tasks(db, rows)[0]
+
+
 # Update add_task function to store deadlines
+@instrumented
 def add_task(title, priority, deadline=None):
-    with SessionLocal() as db:  # Fix `Session` to `SessionLocal`
-        new_task = Task(title=title, priority=priority, deadline=deadline)
-        db.add(new_task)
-        db.commit()
+    """Add a task and return it so callers can show it without a reload"""
+    return _write(_add_task, title, priority, deadline)
+
 
+@instrumented
+@_cached
+def get_task(task_id):
+    """Fetch a single task by id, or None if it does not exist"""
+    records = fetch_records(select_records().where(Task.id == task_id))
+    return records[0] if records else None
 
+
+@instrumented
+@_cached
 def get_all_tasks():
     """Fetch all tasks from the database including their completion status."""
-    with SessionLocal() as db:
-        return db.query(Task).all()
+    return fetch_records(select_records())
+
+
+def parse_order_by(order_by):
+    """
+    Normalize an ordering spec into a list of (column name, descending) pairs.
+    Accepts a column name or a list of them; a leading "-" sorts descending.
+    """
+    if isinstance(order_by, str):
+        order_by = [order_by]
+
+    ordering = []
+    for name in order_by or ():
+        descending = name.startswith("-")
+        name = name.lstrip("-")
+        if name not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot order tasks by {name!r}")
+        ordering.append((name, descending))
+
+    # Tie-break on id so pages are stable between queries
+    if all(name != "id" for name, _ in ordering):
+        ordering.append(("id", False))
+    return ordering
+
+
+def search_terms(search_text):
+    """Split search input into the words matched against task titles."""
+    return re.findall(r"\w+", search_text.lower())
+
+
+def _match_expression(search_text):
+    """
+    Build an FTS5 query matching titles that contain every search word as a
+    word prefix, e.g. "buy mi" -> '"buy"* "mi"*'. None if there are no words.
+    """
+    terms = search_terms(search_text)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _apply_filters(query, filters, source=Task.__table__):
+    """Translate a filters dict into WHERE clauses on a SELECT over `source`."""
+    filters = filters or {}
+    columns = source.c
+    if filters.get("completed") is not None:
+        query = query.filter(columns.completed == filters["completed"])
+    if filters.get("priority") is not None:
+        query = query.filter(columns.priority == filters["priority"])
+    # Half-open deadline range; tasks without a deadline never match
+    if filters.get("due_from") is not None:
+        query = query.filter(columns.deadline >= filters["due_from"])
+    if filters.get("due_before") is not None:
+        query = query.filter(columns.deadline < filters["due_before"])
+    if filters.get("search"):
+        match = _match_expression(filters["search"])
+        # Archived tasks are not in the full-text index
+        if match and source is Task.__table__ and search_index_available():
+            query = query.filter(
+                columns.id.in_(
+                    select(search_index.c.rowid).where(
+                        search_index.c.title.match(match)
+                    )
+                )
+            )
+        else:
+            query = query.filter(
+                columns.title.contains(filters["search"], autoescape=True)
+            )
+    return query
+
+
+@instrumented
+@_cached
+def get_tasks_page(filters=None, order_by="priority", offset=0, limit=None):
+    """
+    Fetch one page of tasks with filtering, ordering and paging done in SQL.
+
+    `filters` may contain `completed` (bool), `priority` (int), `due_from` /
+    `due_before` (dates, inclusive / exclusive) and `search` (words matched as
+    title word prefixes through the full-text index); `order_by` is a spec
+    understood by `parse_order_by`. Archived tasks are left out unless
+    `include_archived` is set, which also makes `search` a substring match.
+    """
+    source = _task_source(filters)
+    statement = _apply_filters(
+        select(*(source.c[field] for field in TaskRecord._fields)), filters, source
+    )
+    for name, descending in parse_order_by(order_by):
+        column = source.c[name]
+        statement = statement.order_by(column.desc() if descending else column.asc())
+    if offset:
+        statement = statement.offset(offset)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return fetch_records(statement)
+
+
+# Pending tasks due within this many days, today included, count as "due soon"
+DUE_SOON_DAYS = 7
+
+
+def overdue_filters(today=None):
+    """Filters selecting pending tasks whose deadline has passed."""
+    return {"completed": False, "due_before": today or date.today()}
+
+
+def due_soon_filters(today=None):
+    """Filters selecting pending tasks due in the next DUE_SOON_DAYS days."""
+    today = today or date.today()
+    return {
+        "completed": False,
+        "due_from": today,
+        "due_before": today + timedelta(days=DUE_SOON_DAYS),
+    }
+
+
+# Urgency of a pending task, as used by get_next_tasks: each priority level
+# counts as much as URGENCY_DAYS_PER_PRIORITY days of deadline, and tasks
+# without a deadline rank as if due in UNDATED_DEADLINE_DAYS days
+URGENCY_DAYS_PER_PRIORITY = 7
+UNDATED_DEADLINE_DAYS = 30
+
 
+def urgency(task, today=None):
+    """Score a task for get_next_tasks; higher is more urgent."""
+    days_left = (
+        (task.deadline - (today or date.today())).days
+        if task.deadline
+        else UNDATED_DEADLINE_DAYS
+    )
+    return (task.priority or 0) * URGENCY_DAYS_PER_PRIORITY - days_left
 
+
+@_cached
+def _next_tasks(k, today):
+    # Urgency falls with the deadline within one priority, so each priority's
+    # most urgent tasks are the first k of an index range scan on
+    # (completed, priority, deadline). Merging those few short runs by score
+    # gives the overall top k without sorting all pending tasks.
+    pending = select_records().where(Task.completed.is_(False))
+    statements = []
+    for priority in PRIORITIES:
+        same_priority = pending.where(Task.priority == priority)
+        statements += [
+            same_priority.where(Task.deadline.is_not(None)).order_by(
+                Task.deadline, Task.id
+            ),
+            same_priority.where(Task.deadline.is_(None)).order_by(Task.id),
+        ]
+    # Imports can bring in other priorities (or none); those rare tasks are
+    # ranked by the urgency score itself
+    days_left = case(
+        (Task.deadline.is_(None), UNDATED_DEADLINE_DAYS),
+        else_=func.julianday(Task.deadline) - func.julianday(today),
+    )
+    score = func.coalesce(Task.priority, 0) * URGENCY_DAYS_PER_PRIORITY - days_left
+    # One range each, so every run is an index seek past the 1..3 entries
+    for other_priority in (
+        Task.priority.is_(None),
+        Task.priority < min(PRIORITIES),
+        Task.priority > max(PRIORITIES),
+    ):
+        statements.append(pending.where(other_priority).order_by(score.desc(), Task.id))
+    with engine.connect() as connection:
+        runs = [
+            list(map(TaskRecord._make, connection.execute(statement.limit(k))))
+            for statement in statements
+        ]
+
+    def key(task):
+        return -urgency(task, today), task.id
+
+    return list(islice(heapq.merge(*runs, key=key), k))
+
+
+@instrumented
+def get_next_tasks(k=5, today=None):
+    """
+    Return the `k` most urgent pending tasks, most urgent first, ranked by
+    `urgency` (priority combined with days left until the deadline).
+    """
+    return _next_tasks(k, today or date.today())
+
+
+@instrumented
+@_cached
+def count_tasks(filters=None):
+    """Count the tasks matching `filters` (see `get_tasks_page`)."""
+    source = _task_source(filters)
+    statement = _apply_filters(
+        select(func.count()).select_from(source), filters, source
+    )
+    with engine.connect() as connection:
+        return connection.execute(statement).scalar_one()
+
+
+@instrumented
+@_cached
+def search_tasks(query, limit=50):
+    """
+    Return up to `limit` tasks whose titles match `query`, best matches first.
+    Each word of `query` matches as a word prefix, so "gro li" finds
+    "Grocery list".
+    """
+    match = _match_expression(query)
+    if match is None:
+        return []
+
+    if not search_index_available():
+        return fetch_records(
+            select_records()
+            .where(Task.title.contains(query, autoescape=True))
+            .order_by(Task.title, Task.id)
+            .limit(limit)
+        )
+    return fetch_records(
+        select_records()
+        .join(search_index, search_index.c.rowid == Task.id)
+        .where(search_index.c.title.match(match))
+        .order_by(search_index.c.rank)
+        .limit(limit)
+    )
+
+
+def _mark_task_complete(db, task_id):
+    updated = _mark_tasks_complete(db, [task_id])
+    return updated[0] if updated else None
+
+
+@instrumented
 def mark_task_complete(task_id):
-    """Mark a task as completed"""
-    with SessionLocal() as db:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task:
-            task.completed = True
-            db.commit()
+    """Mark a task as completed and return it, or None if it does not exist"""
+    return _write(_mark_task_complete, task_id)
+
 
+def _delete_task(db, task_id):
+    return bool(_delete_tasks(db, [task_id]))
 
+
+@instrumented
 def delete_task(task_id: int):
-    """Delete a task from the database by its ID"""
-    with SessionLocal() as db:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task:
-            db.delete(task)
-            db.commit()
-            return True
-        return False
+    """Delete a task, live or archived, from the database by its ID"""
+    return _write(_delete_task, task_id)
 
 
+@instrumented
 def clear_all_tasks():
-    """Delete all tasks from the database"""
+    """Delete all tasks, archived ones included, from the database"""
     with SessionLocal() as db:
         db.query(Task).delete()
+        db.query(ArchivedTask).delete()
+        db.commit()
+        _bump_table_version()
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), MAX_IDS_PER_STATEMENT):
+        yield ids[start : start + MAX_IDS_PER_STATEMENT]
+
+
+def _task_rows(tasks):
+    """Column values for inserting `tasks` (dicts as taken by add_tasks_bulk)."""
+    now = datetime.now()
+    return [
+        {
+            "title": task["title"],
+            "priority": task.get("priority", 1),
+            "deadline": to_deadline(task.get("deadline")),
+            "completed": task.get("completed", False),
+            "completed_at": (
+                task.get("completed_at") or now if task.get("completed") else None
+            ),
+        }
+        for task in tasks
+    ]
+
+
+@instrumented
+def add_tasks_bulk(tasks):
+    """
+    Insert many tasks in a single transaction and return their new ids, one
+    per task in order. `tasks` is an iterable of dicts with `title`,
+    `priority` and optionally `deadline`, `completed` and `completed_at`.
+    """
+    rows = _task_rows(tasks)
+    if not rows:
+        return []
+
+    # A Core insert keeps this a plain executemany; the ORM bulk path splits
+    # rows into many small batches when nullable values vary between rows
+    with SessionLocal() as db:
+        ids = [task.id for task in _insert_tasks(db, rows)]
         db.commit()
+        _bump_table_version()
+        return ids
+
+
+@instrumented
+def merge_tasks(tasks):
+    """
+    Insert or update many tasks (dicts as taken by `add_tasks_bulk`) in one
+    transaction, matching them to live tasks by `content_hash`: the one
+    given in the dict, as exports carry it, else the hash of the title and
+    deadline. Matched tasks take the incoming priority and completion state;
+    tasks matching only an archived one are skipped. Returns
+    (tasks added, tasks changed).
+    """
+    tasks = list(tasks)
+    rows = {}
+    for task, row in zip(tasks, _task_rows(tasks)):
+        # An exported hash tells apart duplicates that share title and deadline
+        row["content_hash"] = task.get("content_hash") or task_hash(
+            row["title"], row["deadline"]
+        )
+        rows[row["content_hash"]] = row  # The last copy of a task wins
+    if not rows:
+        return 0, 0
+
+    table = Task.__table__
+    statement = sqlite.insert(table)
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.content_hash],
+        set_={
+            "priority": excluded.priority,
+            "completed": excluded.completed,
+            # Keep the original completion time of a task that stays completed
+            "completed_at": case(
+                (
+                    excluded.completed.is_(True),
+                    func.coalesce(table.c.completed_at, excluded.completed_at),
+                ),
+                else_=None,
+            ),
+        },
+        # Leave unchanged tasks alone: no write, no change-log entry
+        where=or_(
+            table.c.priority.is_distinct_from(excluded.priority),
+            table.c.completed.is_distinct_from(excluded.completed),
+        ),
+    ).returning(table.c.id)
+
+    with SessionLocal() as db:
+        archived = set()
+        existing = set()
+        for chunk in _chunks(rows):
+            archived.update(
+                db.scalars(
+                    select(ArchivedTask.content_hash).where(
+                        ArchivedTask.content_hash.in_(chunk)
+                    )
+                )
+            )
+            existing.update(
+                db.scalars(
+                    select(table.c.content_hash).where(table.c.content_hash.in_(chunk))
+                )
+            )
+        rows = [
+            row
+            for digest, row in rows.items()
+            if digest in existing or digest not in archived
+        ]
+        if not rows:
+            return 0, 0
+        written = len(db.scalars(statement, rows).all())
+        db.commit()
+    _bump_table_version()
+    added = sum(row["content_hash"] not in existing for row in rows)
+    return added, written - added
+
+
+def _mark_tasks_complete(db, task_ids):
+    updated = []
+    for chunk in _chunks(task_ids):
+        updated.extend(
+            map(
+                TaskRecord._make,
+                db.execute(
+                    update(Task)
+                    .where(Task.id.in_(chunk))
+                    .values(
+                        completed=True,
+                        completed_at=func.coalesce(Task.completed_at, datetime.now()),
+                    )
+                    .returning(*TASK_COLUMNS),
+                    execution_options={"synchronize_session": False},
+                ),
+            )
+        )
+    return updated
+
+
+@instrumented
+def mark_tasks_complete(task_ids):
+    """Mark many tasks as completed in one transaction and return the updated tasks"""
+    return _write(_mark_tasks_complete, task_ids)
+
+
+def _delete_tasks(db, task_ids):
+    deleted = []
+    for chunk in _chunks(task_ids):
+        for model in (Task, ArchivedTask):
+            deleted.extend(
+                db.scalars(
+                    delete(model).where(model.id.in_(chunk)).returning(model.id),
+                    execution_options={"synchronize_session": False},
+                )
+            )
+    return deleted
+
+
+@instrumented
+def delete_tasks(task_ids):
+    """
+    Delete many tasks, live or archived, in one transaction and return the ids
+    that were removed
+    """
+    return _write(_delete_tasks, task_ids)
+
+
+# Completed tasks older than this are moved out of the live table by default
+ARCHIVE_AFTER_DAYS = 30
+ARCHIVE_BATCH_SIZE = 500
+
+
+@instrumented
+def archive_completed_tasks(
+    older_than_days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE, progress=None
+):
+    """
+    Move tasks completed more than `older_than_days` days ago from `tasks` to
+    `tasks_archive`. Each batch of `batch_size` tasks is copied and deleted in
+    its own short transaction, so other writers are never blocked for long;
+    `progress` is called with the running count after every batch.
+    Returns the number of tasks archived.
+    """
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    archived = 0
+    while True:
+        with SessionLocal() as db:
+            task_ids = db.scalars(
+                select(Task.id)
+                .where(Task.completed.is_(True), Task.completed_at < cutoff)
+                .limit(batch_size)
+            ).all()
+            if not task_ids:
+                return archived
+
+            db.execute(
+                insert(ArchivedTask).from_select(
+                    [*TaskRecord._fields, "content_hash", "archived_at"],
+                    select(
+                        *TASK_COLUMNS, Task.content_hash, literal(datetime.now())
+                    ).where(Task.id.in_(task_ids)),
+                )
+            )
+            db.execute(
+                delete(Task).where(Task.id.in_(task_ids)),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+        _bump_table_version()
+        archived += len(task_ids)
+        if progress:
+            progress(archived)
+
+
+# Write-behind: edits submitted within this window of each other share one commit
+WRITE_BEHIND_WINDOW_MS = 20
+WRITE_BEHIND_MAX_BATCH = 500
+
+
+class WriteBehindQueue:
+    """
+    Applies write operations on a background thread, committing all of those
+    submitted within `window_ms` of the first pending one in a single
+    transaction (group commit), so bursts of edits pay for one fsync.
+
+    Each call returns a Future that resolves to what the matching direct
+    function returns, once its batch has committed. Call `flush()` before a
+    read that must see earlier writes; `close()` commits what is queued.
+    """
+
+    def __init__(
+        self, window_ms=WRITE_BEHIND_WINDOW_MS, max_batch=WRITE_BEHIND_MAX_BATCH
+    ):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending = []
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._committed = 0
+        self._flush_target = 0  # Stop waiting for more once this many are queued
+        self._closed = False
+        self.batches = 0
+        self.max_batch_size = 0
+        self.commit_latency = instrumentation.Histogram()
+        self._thread = threading.Thread(
+            target=self._run, name="write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, operation, *args):
+        """Queue `operation(db, *args)` and return a Future for its result"""
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The write-behind queue is closed")
+            self._pending.append((operation, args, future))
+            self._submitted += 1
+            self._condition.notify_all()
+        return future
+
+    def add_task(self, title, priority, deadline=None):
+        # Reject a bad deadline now rather than from inside someone's batch
+        return self.submit(_add_task, title, priority, to_deadline(deadline))
+
+    def mark_task_complete(self, task_id):
+        return self.submit(_mark_task_complete, task_id)
+
+    def delete_task(self, task_id):
+        return self.submit(_delete_task, task_id)
+
+    def mark_tasks_complete(self, task_ids):
+        return self.submit(_mark_tasks_complete, list(task_ids))
+
+    def delete_tasks(self, task_ids):
+        return self.submit(_delete_tasks, list(task_ids))
+
+    def flush(self, timeout=None):
+        """
+        Commit everything submitted so far without waiting out the window.
+        Returns False if `timeout` seconds passed first.
+        """
+        with self._condition:
+            target = self._submitted
+            self._flush_target = max(self._flush_target, target)
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._committed >= target, timeout)
+
+    def close(self):
+        """Commit the queued operations and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def stats(self):
+        """Batch sizes and commit latency achieved so far"""
+        with self._condition:
+            latency = self.commit_latency.summary()
+            return {
+                "batches": self.batches,
+                "operations": self._committed,
+                "pending": len(self._pending),
+                "mean_batch_size": (
+                    round(self._committed / self.batches, 2) if self.batches else 0.0
+                ),
+                "max_batch_size": self.max_batch_size,
+                "commit_p50_ms": latency["p50_ms"],
+                "commit_p95_ms": latency["p95_ms"],
+                "commit_max_ms": latency["max_ms"],
+            }
+
+    def _next_batch(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending or self._closed)
+            if not self._pending:
+                return None  # Closed and drained
+            deadline = time.monotonic() + self.window
+            while (
+                len(self._pending) < self.max_batch
+                and not self._closed
+                and self._flush_target <= self._committed
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            live = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            start = time.perf_counter()
+            try:
+                with SessionLocal() as db:
+                    results = [operation(db, *args) for operation, args, _ in live]
+                    db.commit()
+            except Exception:
+                results = None
+            else:
+                _bump_table_version()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            if results is None:
+                # Replay one by one so a failing operation only fails its own Future
+                for operation, args, future in live:
+                    try:
+                        future.set_result(_write(operation, *args))
+                    except Exception as error:
+                        future.set_exception(error)
+            else:
+                for (_, _, future), result in zip(live, results):
+                    future.set_result(result)
+
+            instrumentation.record("write_behind.commit", elapsed_ms, len(live))
+            with self._condition:
+                self.batches += 1
+                self.max_batch_size = max(self.max_batch_size, len(batch))
+                self.commit_latency.add(elapsed_ms, len(live))
+                self._committed += len(batch)
+                self._condition.notify_all()
+
+
+write_behind = None
+
+
+def enable_write_behind(
+    window_ms=WRITE_BEHIND_WINDOW_MS, max_batch=WRITE_BEHIND_MAX_BATCH
+):
+    """Start the process-wide WriteBehindQueue; it is flushed at exit"""
+    global write_behind
+    if write_behind is None:
+        write_behind = WriteBehindQueue(window_ms, max_batch)
+        atexit.register(write_behind.close)
+    return write_behind
+
+
+def flush_writes():
+    """Commit queued writes, if any, so the next read sees them"""
+    if write_behind is not None:
+        write_behind.flush()
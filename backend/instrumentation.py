@@ -0,0 +1,213 @@
+"""
+Opt-in latency instrumentation for the backend and the GUI.
+
+Nothing is recorded until `enable(engine)` is called, or the process starts
+with TODO_INSTRUMENT=1 (set TODO_INSTRUMENT_FILE to dump the histograms to
+that JSON file at exit). Once enabled it records:
+
+- `db.<function>`: wall time of every instrumented backend.database call
+  that reached the database, with the number of rows returned where the
+  result is a list
+- `cache.<function>`: the same for calls answered from the query cache
+- `sql.<function>.<VERB>`: each SQL statement that call executed, with the
+  cursor's row count for INSERT/UPDATE/DELETE
+- anything timed through `timed()` / `record()`, e.g. `gui.update_task_list`
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+MAX_SAMPLES = 10_000  # Per histogram; older samples are dropped first
+
+_enabled = False
+_engine = None
+_current_function = contextvars.ContextVar("instrumented_function", default=None)
+# [cache hits, cache misses] seen by the running instrumented call
+_cache_lookups = contextvars.ContextVar("cache_lookups", default=None)
+
+
+class Histogram:
+    """Latency samples for one operation, with exact totals and recent samples."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, elapsed_ms, rows=None):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if rows is not None and rows >= 0:
+            self.rows += rows
+        self.samples.append(elapsed_ms)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+
+        def pick(fraction):
+            if not ordered:
+                return 0.0
+            return round(
+                ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 3
+            )
+
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95),
+            "p99_ms": pick(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+        }
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def is_enabled():
+    return _enabled
+
+
+def record(name, elapsed_ms, rows=None):
+    """Add one sample to the `name` histogram (no-op while disabled)."""
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(elapsed_ms, rows)
+
+
+@contextmanager
+def timed(name):
+    """Time the body of a `with` block into the `name` histogram."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000)
+
+
+def note_cache_lookup(hit):
+    """Tell the running instrumented call whether a cached read hit; see cache.py."""
+    lookups = _cache_lookups.get()
+    if lookups is not None:
+        lookups[0 if hit else 1] += 1
+
+
+def instrumented(func):
+    """
+    Record calls to a backend.database function as `db.<name>`, or as
+    `cache.<name>` when every cached read the call made was a hit.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        lookups = [0, 0]
+        function_token = _current_function.set(func.__name__)
+        lookups_token = _cache_lookups.set(lookups)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            _cache_lookups.reset(lookups_token)
+            _current_function.reset(function_token)
+        hits, misses = lookups
+        record(
+            f"{'cache' if hits and not misses else 'db'}.{func.__name__}",
+            (time.perf_counter() - start) * 1000,
+            len(result) if isinstance(result, list) else None,
+        )
+        return result
+
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.instrumentation_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own execution context, so recording switched on
+    # or off while a statement runs never pairs it with another one's start
+    start = getattr(context, "instrumentation_start", None)
+    if start is None:
+        return
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "?"
+    function = _current_function.get() or "other"
+    record(
+        f"sql.{function}.{verb}",
+        (time.perf_counter() - start) * 1000,
+        cursor.rowcount if verb in ("INSERT", "UPDATE", "DELETE") else None,
+    )
+
+
+def enable(engine):
+    """Start recording, hooking statement timing into `engine`."""
+    global _enabled, _engine
+    if _engine is not None and _engine is not engine:
+        disable()
+    if _engine is None:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        _engine = engine
+    _enabled = True
+
+
+def disable():
+    """Stop recording and detach from the engine; collected data is kept."""
+    global _enabled, _engine
+    _enabled = False
+    if _engine is not None:
+        event.remove(_engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(_engine, "after_cursor_execute", _after_cursor_execute)
+        _engine = None
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def snapshot():
+    """Return {name: summary} for every histogram, sorted by name."""
+    with _lock:
+        return {name: _histograms[name].summary() for name in sorted(_histograms)}
+
+
+def dump(filename):
+    """Write the current snapshot to `filename` as JSON."""
+    with open(filename, "w") as file:
+        json.dump(snapshot(), file, indent=2)
+
+
+def enable_from_environment(engine):
+    """Honor TODO_INSTRUMENT / TODO_INSTRUMENT_FILE; called by backend.database."""
+    if os.environ.get("TODO_INSTRUMENT") != "1":
+        return
+    enable(engine)
+    filename = os.environ.get("TODO_INSTRUMENT_FILE")
+    if filename:
+        atexit.register(dump, filename)
@@ -0,0 +1,162 @@
+"""
+Versioned schema migrations for tasks.db.
+
+The schema version lives in SQLite's `PRAGMA user_version`. Step N in
+MIGRATIONS upgrades a database from version N-1 to N. All pending steps run
+in one transaction, so an interrupted upgrade leaves the file untouched.
+A database without a tasks table is stamped with the latest version;
+`Base.metadata.create_all` then builds the current schema directly.
+
+To change the schema, update backend/models.py and append a step here that
+brings existing files to the same shape. Never edit a released step.
+"""
+
+from datetime import datetime
+
+from backend.models import parse_deadline, task_hash
+
+MIGRATIONS = []
+
+
+def migration(step):
+    """Register `step(connection)` as the next schema version."""
+    MIGRATIONS.append(step)
+    return step
+
+
+def _columns(connection, table):
+    return {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+
+
+@migration
+def typed_deadline(connection):
+    """
+    Rebuild tasks with `deadline DATE` (older files used VARCHAR or had no
+    deadline column at all) and normalize free-form deadlines to YYYY-MM-DD.
+    Unreadable deadlines become NULL. Ids are kept, so the search index stays
+    valid; its triggers are recreated by backend.database on startup.
+    """
+    has_deadline = "deadline" in _columns(connection, "tasks")
+    connection.execute(
+        """CREATE TABLE tasks_new (
+            id INTEGER NOT NULL PRIMARY KEY,
+            title VARCHAR NOT NULL,
+            priority INTEGER,
+            completed BOOLEAN,
+            deadline DATE
+        )"""
+    )
+    connection.execute(
+        "INSERT INTO tasks_new (id, title, priority, completed, deadline) "
+        f"SELECT id, title, priority, completed, {'deadline' if has_deadline else 'NULL'}"
+        " FROM tasks"
+    )
+
+    changed = []
+    for task_id, deadline in connection.execute(
+        "SELECT id, deadline FROM tasks_new WHERE deadline IS NOT NULL"
+    ):
+        parsed = parse_deadline(deadline)
+        normalized = parsed.isoformat() if parsed else None
+        if normalized != deadline:
+            changed.append((normalized, task_id))
+    connection.executemany("UPDATE tasks_new SET deadline = ? WHERE id = ?", changed)
+
+    connection.execute("DROP TABLE tasks")
+    connection.execute("ALTER TABLE tasks_new RENAME TO tasks")
+
+
+@migration
+def completed_at(connection):
+    """
+    Rebuild tasks with a `completed_at` column and AUTOINCREMENT ids, so ids of
+    archived tasks are never handed out again. Tasks already completed get the
+    upgrade time as their completion time.
+    """
+    connection.execute(
+        """CREATE TABLE tasks_new (
+            id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            title VARCHAR NOT NULL,
+            priority INTEGER,
+            completed BOOLEAN,
+            deadline DATE,
+            completed_at DATETIME
+        )"""
+    )
+    connection.execute(
+        "INSERT INTO tasks_new "
+        "(id, title, priority, completed, deadline, completed_at) "
+        "SELECT id, title, priority, completed, deadline, "
+        "CASE WHEN completed THEN ? END FROM tasks",
+        (datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f"),),
+    )
+    connection.execute("DROP TABLE tasks")
+    connection.execute("ALTER TABLE tasks_new RENAME TO tasks")
+
+
+@migration
+def content_hash(connection):
+    """
+    Add `content_hash` to tasks and tasks_archive and fill it in. Tasks that
+    duplicate an earlier task's title and deadline get their id mixed into
+    the hash, so all of them survive the unique index.
+    """
+    for table in ("tasks", "tasks_archive"):
+        exists = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if not exists:
+            continue  # create_all builds it with the column
+        connection.execute(
+            f"ALTER TABLE {table} ADD COLUMN content_hash VARCHAR NOT NULL DEFAULT ''"
+        )
+        seen = set()
+        hashes = []
+        for task_id, title, deadline in connection.execute(
+            f"SELECT id, title, deadline FROM {table} ORDER BY id"
+        ):
+            digest = task_hash(title, deadline)
+            if digest in seen:
+                digest = task_hash(title, deadline, salt=task_id)
+            seen.add(digest)
+            hashes.append((digest, task_id))
+        connection.executemany(
+            f"UPDATE {table} SET content_hash = ? WHERE id = ?", hashes
+        )
+
+
+def schema_version(connection):
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(engine):
+    """Upgrade the database behind `engine` to the latest schema version."""
+    raw = engine.raw_connection()
+    try:
+        connection = raw.driver_connection
+        if schema_version(connection) >= len(MIGRATIONS):
+            return
+
+        # Manage the transaction by hand: the sqlite3 module would otherwise
+        # commit around the DDL statements, making a failed upgrade partial
+        isolation_level = connection.isolation_level
+        connection.isolation_level = None
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                version = schema_version(connection)  # Another process may have won
+                exists = connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"
+                ).fetchone()
+                if exists:
+                    for step in MIGRATIONS[version:]:
+                        step(connection)
+                connection.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.isolation_level = isolation_level
+    finally:
+        raw.close()
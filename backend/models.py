@@ -1,31 +1,117 @@
-from sqlalchemy import Column, Integer, String, Boolean, create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import hashlib
+from datetime import date, datetime
+
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Index
+from sqlalchemy.orm import declarative_base
 
 # Base class for ORM models
 Base = declarative_base()
 
 
+def _content_hash_default(context):
+    parameters = context.get_current_parameters()
+    return task_hash(parameters["title"], parameters.get("deadline"))
+
+
 class Task(Base):
     """Task Model - Represents a task in the database"""
 
     __tablename__ = "tasks"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     priority = Column(Integer, default=1)  # 1 = Low, 2 = Medium, 3 = High
     completed = Column(Boolean, default=False)
+    deadline = Column(Date, nullable=True)  # Stored as "YYYY-MM-DD", read as a date
+    completed_at = Column(DateTime, nullable=True)  # Set when marked completed
+    # Identity of the task across exports and imports; see task_hash
+    content_hash = Column(String, nullable=False, default=_content_hash_default)
+
+    __table_args__ = (
+        # Serves the filtered/sorted list queries issued by get_tasks_page
+        Index(
+            "ix_tasks_completed_priority_deadline", "completed", "priority", "deadline"
+        ),
+        # Range scans for "overdue" / "due soon" over pending tasks
+        Index("ix_tasks_completed_deadline", "completed", "deadline"),
+        Index("ix_tasks_title", "title"),
+        # Finds completed tasks old enough to archive
+        Index("ix_tasks_completed_completed_at", "completed", "completed_at"),
+        # Conflict target of merge imports: one live task per title and deadline
+        Index("ux_tasks_content_hash", "content_hash", unique=True),
+        # Ids are never reused, so archived and live tasks can't collide
+        {"sqlite_autoincrement": True},
+    )
+
+
+class ArchivedTask(Base):
+    """A completed task moved out of `tasks` by archive_completed_tasks"""
+
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # Original task id
+    title = Column(String, nullable=False)
+    priority = Column(Integer)
+    completed = Column(Boolean)
+    deadline = Column(Date, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    content_hash = Column(String, nullable=False)
+    archived_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_tasks_archive_title", "title"),
+        Index("ix_tasks_archive_completed_at", "completed_at"),
+        Index("ix_tasks_archive_content_hash", "content_hash"),
+    )
+
+
+class TaskChange(Base):
+    """One committed insert, update or delete of a task, logged by triggers"""
+
+    __tablename__ = "task_changes"
+    __table_args__ = {"sqlite_autoincrement": True}  # Never reuse a sequence number
+
+    seq = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)  # "insert", "update" or "delete"
+
+
+# Deadlines are exported as "YYYY-MM-DD"; older JSON saves used "DD-MM-YYYY"
+DEADLINE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y")
 
 
-# Database connection setup
-DATABASE_URL = "sqlite:///tasks.db"  # Use PostgreSQL in production
-engine = create_engine(DATABASE_URL, echo=True)  # echo=True for debugging
-SessionLocal = sessionmaker(bind=engine)
+def parse_deadline(value):
+    """Return `value` as a date, or None if it is missing or not a known format."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value or not isinstance(value, str):
+        return None
+    for deadline_format in DEADLINE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), deadline_format).date()
+        except ValueError:
+            continue
+    return None
 
 
-def init_db():
-    """Create database tables if they do not exist"""
-    Base.metadata.create_all(engine)
+def to_deadline(value):
+    """Like `parse_deadline`, but reject values that are present and unreadable."""
+    deadline = parse_deadline(value)
+    if deadline is None and value not in (None, ""):
+        raise ValueError(f"Invalid deadline {value!r}, expected YYYY-MM-DD")
+    return deadline
 
 
-if __name__ == "__main__":
-    init_db()  # Initialize the database when this script runs
+def task_hash(title, deadline=None, salt=None):
+    """
+    Stable identity of a task: a hash of its title and deadline, which never
+    change, unlike priority and completion. `salt` tells apart duplicates
+    that existed before the hash was introduced.
+    """
+    deadline = parse_deadline(deadline)
+    key = f"{title}\0{deadline.isoformat() if deadline else ''}"
+    if salt is not None:
+        key += f"\0{salt}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
@@ -0,0 +1,129 @@
+"""
+Task operations as an interface, used by the HTTP server and the tests.
+
+TaskRepository lists the operations the server needs. SQLTaskRepository
+forwards them to backend.database and backend.stats, so it works on the
+process-wide engine that TODO_STORAGE selected (backend/config.py) rather
+than one of its own. The GUI and the CLI call backend.database directly.
+"""
+
+from abc import ABC, abstractmethod
+
+from backend import database, stats
+
+
+class TaskRepository(ABC):
+    """Task storage operations; see the backend.database functions of the same name."""
+
+    @abstractmethod
+    def add_task(self, title, priority, deadline=None):
+        """Add a task and return its TaskRecord."""
+
+    @abstractmethod
+    def get_task(self, task_id):
+        """Return the TaskRecord with `task_id`, or None."""
+
+    @abstractmethod
+    def get_tasks_page(self, filters=None, order_by="priority", offset=0, limit=None):
+        """Return one page of TaskRecords matching `filters`."""
+
+    @abstractmethod
+    def count_tasks(self, filters=None):
+        """Count the tasks matching `filters`."""
+
+    @abstractmethod
+    def search_tasks(self, query, limit=50):
+        """Return the best title matches for `query`."""
+
+    @abstractmethod
+    def get_next_tasks(self, k=5, today=None):
+        """Return the `k` most urgent pending tasks."""
+
+    @abstractmethod
+    def get_task_stats(self, today=None):
+        """Return the summary statistics dict."""
+
+    @abstractmethod
+    def mark_task_complete(self, task_id):
+        """Complete a task and return it, or None if it does not exist."""
+
+    @abstractmethod
+    def mark_tasks_complete(self, task_ids):
+        """Complete many tasks and return the updated TaskRecords."""
+
+    @abstractmethod
+    def delete_task(self, task_id):
+        """Delete a task; False if it did not exist."""
+
+    @abstractmethod
+    def delete_tasks(self, task_ids):
+        """Delete many tasks and return the ids removed."""
+
+    @abstractmethod
+    def merge_tasks(self, tasks):
+        """Insert or update tasks by content; return (added, updated)."""
+
+    @abstractmethod
+    def clear_all_tasks(self):
+        """Delete every task, archived ones included."""
+
+    @abstractmethod
+    def version(self):
+        """A number that changes whenever the stored tasks may have changed."""
+
+
+class SQLTaskRepository(TaskRepository):
+    """TaskRepository over backend.database and its process-wide engine."""
+
+    def add_task(self, title, priority, deadline=None):
+        return database.add_task(title, priority, deadline)
+
+    def get_task(self, task_id):
+        return database.get_task(task_id)
+
+    def get_tasks_page(self, filters=None, order_by="priority", offset=0, limit=None):
+        return database.get_tasks_page(filters, order_by, offset, limit)
+
+    def count_tasks(self, filters=None):
+        return database.count_tasks(filters)
+
+    def search_tasks(self, query, limit=50):
+        return database.search_tasks(query, limit)
+
+    def get_next_tasks(self, k=5, today=None):
+        return database.get_next_tasks(k, today)
+
+    def get_task_stats(self, today=None):
+        return stats.get_task_stats(today)
+
+    def mark_task_complete(self, task_id):
+        return database.mark_task_complete(task_id)
+
+    def mark_tasks_complete(self, task_ids):
+        return database.mark_tasks_complete(task_ids)
+
+    def delete_task(self, task_id):
+        return database.delete_task(task_id)
+
+    def delete_tasks(self, task_ids):
+        return database.delete_tasks(task_ids)
+
+    def merge_tasks(self, tasks):
+        return database.merge_tasks(tasks)
+
+    def clear_all_tasks(self):
+        return database.clear_all_tasks()
+
+    def version(self):
+        return database.get_table_version()
+
+
+_repository = None
+
+
+def get_repository():
+    """The process-wide repository over the configured storage."""
+    global _repository
+    if _repository is None:
+        _repository = SQLTaskRepository()
+    return _repository
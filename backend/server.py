@@ -0,0 +1,369 @@
+"""
+Local HTTP API over the task store.
+
+    python -m backend.server --port 8765
+
+Endpoints (JSON in and out):
+    GET    /tasks?completed=&priority=&due=overdue|soon&search=&include_archived=
+                 &order_by=&offset=&limit=
+    POST   /tasks                {"title": ..., "priority": 1-3, "deadline": ...}
+    GET    /tasks/<id>
+    PATCH  /tasks/<id>           {"completed": true}
+    DELETE /tasks/<id>
+    GET    /search?q=&limit=
+
+GET responses carry an ETag derived from the table version (plus today's
+date for /stats and the due= views, which change at midnight), and a request
+whose If-None-Match still matches is answered with 304 before touching the
+database. Database calls run on a fixed-size thread pool, which bounds the
+number of SQLite connections in use; client connections are capped too.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from backend import database
+from backend.changes import ChangeFeed
+from backend.repository import get_repository
+from backend.utils import task_to_dict
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_CONNECTIONS = 64
+DB_POOL_SIZE = 4
+MAX_BODY_BYTES = 1 << 20
+MAX_PAGE_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+
+
+def _int_param(query, name, default=None):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        return int(values[0])
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer")
+
+
+def _limit_param(query, default):
+    """The `limit` parameter, clamped to 1..MAX_PAGE_SIZE."""
+    # Clamp from below too: SQLite reads a negative LIMIT as no limit at all
+    return max(1, min(_int_param(query, "limit", default), MAX_PAGE_SIZE))
+
+
+def _bool_param(query, name):
+    values = query.get(name)
+    if not values:
+        return None
+    if values[0].lower() in ("1", "true", "yes"):
+        return True
+    if values[0].lower() in ("0", "false", "no"):
+        return False
+    raise HTTPError(400, f"{name} must be true or false")
+
+
+class TaskServer:
+    """asyncio HTTP/1.1 server exposing backend.database over JSON."""
+
+    ROUTES = [
+        ("GET", re.compile(r"^/tasks$"), "list_tasks"),
+        ("POST", re.compile(r"^/tasks$"), "create_task"),
+        ("GET", re.compile(r"^/tasks/(\d+)$"), "get_task"),
+        ("PATCH", re.compile(r"^/tasks/(\d+)$"), "update_task"),
+        ("DELETE", re.compile(r"^/tasks/(\d+)$"), "delete_task"),
+        ("GET", re.compile(r"^/search$"), "search"),
+        ("GET", re.compile(r"^/stats$"), "stats"),
+    ]
+
+    def __init__(
+        self,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        max_connections=MAX_CONNECTIONS,
+        db_pool_size=DB_POOL_SIZE,
+    ):
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(
+            max_workers=db_pool_size, thread_name_prefix="task-db"
+        )
+        self.connection_slots = asyncio.Semaphore(max_connections)
+        # Distinguishes ETags from a previous run, whose versions restart at 0
+        self.instance = uuid.uuid4().hex[:8]
+        # Notices commits from other processes, which do not bump the version
+        self.changes = ChangeFeed()
+        self.changes.open()
+        self.changes_lock = threading.Lock()  # The feed has a single connection
+        self.tasks = get_repository()
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=True)
+        self.changes.close()
+
+    def _check_changes(self):
+        with self.changes_lock:
+            if self.changes.check():
+                database.note_external_change()
+
+    async def etag(self, dated=False):
+        """The current ETag; `dated` ones also change when the date does."""
+        # check() runs a read transaction, so keep it off the event loop
+        await self._run(self._check_changes)
+        tag = f"{self.instance}-{self.tasks.version()}"
+        if dated:
+            tag += f"-{date.today().isoformat()}"
+        return f'W/"{tag}"'
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking backend call on the database pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def _handle_connection(self, reader, writer):
+        async with self.connection_slots:
+            try:
+                while await self._handle_request(reader, writer):
+                    pass
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+            finally:
+                writer.close()
+
+    async def _handle_request(self, reader, writer):
+        """Serve one request; returns False when the connection should close."""
+        request_line = await reader.readline()
+        if not request_line:
+            return False
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            await self._respond(writer, 400, {"error": "Malformed request line"})
+            return False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (
+            headers.get("connection", "").lower() != "close"
+            if version == "HTTP/1.1"
+            else headers.get("connection", "").lower() == "keep-alive"
+        )
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            await self._respond(writer, 400, {"error": "Invalid Content-Length"})
+            return False
+        if length > MAX_BODY_BYTES:
+            await self._respond(writer, 413, {"error": "Request body too large"})
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        try:
+            status, payload, extra_headers = await self._dispatch(
+                method, target, headers, body
+            )
+        except HTTPError as error:
+            status, payload, extra_headers = error.status, {"error": str(error)}, {}
+        except ValueError as error:
+            status, payload, extra_headers = 400, {"error": str(error)}, {}
+        except Exception:
+            logger.exception("Error serving %s %s", method, target)
+            status, payload, extra_headers = 500, {"error": "Internal server error"}, {}
+
+        await self._respond(writer, status, payload, extra_headers, keep_alive)
+        return keep_alive
+
+    async def _dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        path_matched = False
+        for route_method, pattern, handler_name in self.ROUTES:
+            match = pattern.match(url.path)
+            if not match:
+                continue
+            path_matched = True
+            if route_method != method:
+                continue
+
+            if method == "GET":
+                # Answer conditional polls without running the query
+                # Overdue counts and the burndown move on at midnight
+                etag = await self.etag(
+                    dated=handler_name == "stats"
+                    or (handler_name == "list_tasks" and bool(query.get("due")))
+                )
+                if headers.get("if-none-match") == etag:
+                    return 304, None, {"ETag": etag}
+                status, payload = await getattr(self, handler_name)(
+                    *match.groups(), query=query
+                )
+                return status, payload, {"ETag": etag}
+
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise HTTPError(400, "Request body must be a JSON object")
+            status, payload = await getattr(self, handler_name)(
+                *match.groups(), data=data
+            )
+            return status, payload, {}
+
+        raise HTTPError(405 if path_matched else 404)
+
+    async def _respond(
+        self, writer, status, payload, extra_headers=None, keep_alive=False
+    ):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        if payload is not None:
+            head.append("Content-Type: application/json")
+        head.append(f"Content-Length: {len(body)}")
+        head.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        head.extend(f"{name}: {value}" for name, value in (extra_headers or {}).items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    # Handlers
+
+    async def list_tasks(self, query):
+        filters = {
+            "completed": _bool_param(query, "completed"),
+            "priority": _int_param(query, "priority"),
+            "search": query.get("search", [""])[0],
+            "include_archived": _bool_param(query, "include_archived"),
+        }
+        due = query.get("due", [""])[0]
+        if due == "overdue":
+            filters.update(database.overdue_filters())
+        elif due == "soon":
+            filters.update(database.due_soon_filters())
+        elif due:
+            raise HTTPError(400, "due must be overdue or soon")
+        order_by = query.get("order_by", ["-priority"])[0].split(",")
+        offset = max(0, _int_param(query, "offset", 0))
+        limit = _limit_param(query, 100)
+
+        tasks = await self._run(
+            self.tasks.get_tasks_page, filters, order_by, offset, limit
+        )
+        total = await self._run(self.tasks.count_tasks, filters)
+        return 200, {
+            "tasks": [task_to_dict(task) for task in tasks],
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+        }
+
+    async def create_task(self, data):
+        title = str(data.get("title", "")).strip()
+        if not title:
+            raise HTTPError(400, "title is required")
+        priority = data.get("priority", 1)
+        if priority not in (1, 2, 3):
+            raise HTTPError(400, "priority must be 1, 2 or 3")
+
+        task = await self._run(
+            self.tasks.add_task, title, priority, data.get("deadline")
+        )
+        return 201, task_to_dict(task)
+
+    async def get_task(self, task_id, query):
+        task = await self._run(self.tasks.get_task, int(task_id))
+        if task is None:
+            raise HTTPError(404, f"No task with id {task_id}")
+        return 200, task_to_dict(task)
+
+    async def update_task(self, task_id, data):
+        if data != {"completed": True}:
+            raise HTTPError(400, 'Only {"completed": true} is supported')
+        task = await self._run(self.tasks.mark_task_complete, int(task_id))
+        if task is None:
+            raise HTTPError(404, f"No task with id {task_id}")
+        return 200, task_to_dict(task)
+
+    async def delete_task(self, task_id, data):
+        if not await self._run(self.tasks.delete_task, int(task_id)):
+            raise HTTPError(404, f"No task with id {task_id}")
+        return 204, None
+
+    async def search(self, query):
+        text = query.get("q", [""])[0]
+        limit = _limit_param(query, 50)
+        tasks = await self._run(self.tasks.search_tasks, text, limit)
+        return 200, {"tasks": [task_to_dict(task) for task in tasks]}
+
+    async def stats(self, query):
+        return 200, await self._run(self.tasks.get_task_stats)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    server = await TaskServer(host, port, **options).start()
+    print(f"Serving tasks on http://{server.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the task store over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS)
+    parser.add_argument("--db-pool-size", type=int, default=DB_POOL_SIZE)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(
+            serve(
+                args.host,
+                args.port,
+                max_connections=args.max_connections,
+                db_pool_size=args.db_pool_size,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
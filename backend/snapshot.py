@@ -0,0 +1,224 @@
+"""
+Columnar snapshot of the task list for instant startup.
+
+The GUI writes every live task to SNAPSHOT_FILE on exit and after saving, in
+the order of its default view. The file sits next to the configured
+database and is named after it (tasks.db -> tasks.snapshot); in-memory
+storage has no snapshot. On launch it memory-maps the file and shows
+the first rows straight away, before the database has been opened. It then
+checks the snapshot against the database in the background with
+`is_current()`, and discards it if the tasks changed since it was written.
+
+File layout (native byte order, every array 8-byte aligned):
+
+    header       magic, byte order, task count, change log position, title bytes
+    id           int64[count]
+    completed_at int64[count]    microseconds since 1970-01-01, 0 = none
+    title_end    uint64[count]   end offset of each title in the blob
+    deadline     int32[count]    date ordinal, 0 = none
+    priority     int8[count]
+    completed    uint8[count]
+    titles       UTF-8 blob
+
+Rows are decoded on demand, so opening a snapshot costs the same for ten
+tasks as for a million.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+
+from backend.config import MEMORY
+from backend.database import (
+    Task,
+    TaskRecord,
+    engine,
+    parse_order_by,
+    select_records,
+    storage_config,
+)
+from backend.models import TaskChange
+
+
+def _snapshot_file():
+    path = engine.url.database
+    if storage_config.storage == MEMORY or path in (None, "", ":memory:"):
+        return None
+    return os.path.splitext(path)[0] + ".snapshot"
+
+
+SNAPSHOT_FILE = _snapshot_file()  # None: snapshots are off
+SNAPSHOT_ORDER = "-priority"  # The GUI's default sort, so the rows paint as stored
+
+MAGIC = b"TODOSNP1"
+HEADER = struct.Struct("=8sB7xqqq")  # magic, little endian?, count, seq, title bytes
+LITTLE_ENDIAN = sys.byteorder == "little"
+
+# (typecode, TaskRecord field or None for the title offsets), widest first
+COLUMNS = [
+    ("q", "id"),
+    ("q", "completed_at"),
+    ("Q", None),
+    ("i", "deadline"),
+    ("b", "priority"),
+    ("B", "completed"),
+]
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def _stamp(connection):
+    """Change log position and task count: both move on every committed write."""
+    seq = connection.execute(select(func.max(TaskChange.seq))).scalar() or 0
+    count = connection.execute(select(func.count()).select_from(Task)).scalar()
+    return seq, count
+
+
+def write_snapshot(filename=SNAPSHOT_FILE):
+    """Write every live task to `filename` and return how many were written."""
+    if filename is None:
+        return 0
+    columns = {field: array(code) for code, field in COLUMNS if field}
+    title_ends = array("Q")
+    titles = bytearray()
+
+    with engine.connect() as connection:
+        with connection.begin():  # Stamp and rows from the same read transaction
+            seq, _ = _stamp(connection)
+            statement = select_records()
+            for name, descending in parse_order_by(SNAPSHOT_ORDER):
+                column = getattr(Task, name)
+                statement = statement.order_by(
+                    column.desc() if descending else column.asc()
+                )
+            for task in connection.execute(statement):
+                columns["id"].append(task.id)
+                columns["completed_at"].append(
+                    (task.completed_at - EPOCH) // MICROSECOND
+                    if task.completed_at
+                    else 0
+                )
+                columns["deadline"].append(
+                    task.deadline.toordinal() if task.deadline else 0
+                )
+                columns["priority"].append(task.priority or 0)
+                columns["completed"].append(bool(task.completed))
+                titles += task.title.encode("utf-8")
+                title_ends.append(len(titles))
+
+    count = len(title_ends)
+    temporary = f"{filename}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, LITTLE_ENDIAN, count, seq, len(titles)))
+        for code, field in COLUMNS:
+            data = columns[field] if field else title_ends
+            file.write(data.tobytes())
+            file.write(bytes(-file.tell() % 8))
+        file.write(titles)
+    os.replace(temporary, filename)  # Readers never see a half-written file
+    return count
+
+
+def discard_snapshot(filename=SNAPSHOT_FILE):
+    if filename is None:
+        return
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+
+
+class Snapshot:
+    """A memory-mapped snapshot file; a read-only sequence of TaskRecords."""
+
+    def __init__(self, file):
+        self._file = file
+        self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self):
+        magic, little_endian, count, self.seq, title_bytes = HEADER.unpack_from(
+            self._map
+        )
+        if magic != MAGIC or little_endian != LITTLE_ENDIAN:
+            raise ValueError("Not a task snapshot written on this platform")
+        sizes = [array(code).itemsize * count for code, _ in COLUMNS]
+        end = HEADER.size + sum(size + -size % 8 for size in sizes) + title_bytes
+        if len(self._map) != end:
+            raise ValueError("Truncated task snapshot")
+        self.count = count
+
+        view = memoryview(self._map)
+        offset = HEADER.size
+        self._columns = {}
+        for (code, field), size in zip(COLUMNS, sizes):
+            self._columns[field] = view[offset : offset + size].cast(code)
+            offset += size + -size % 8
+        self._titles = view[offset:]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.count:
+            raise IndexError(row)
+        columns = self._columns
+        start = columns[None][row - 1] if row else 0
+        deadline = columns["deadline"][row]
+        completed_at = columns["completed_at"][row]
+        return TaskRecord(
+            id=columns["id"][row],
+            title=str(self._titles[start : columns[None][row]], "utf-8"),
+            priority=columns["priority"][row],
+            completed=bool(columns["completed"][row]),
+            deadline=date.fromordinal(deadline) if deadline else None,
+            completed_at=EPOCH + completed_at * MICROSECOND if completed_at else None,
+        )
+
+    def records(self, start=0, stop=None):
+        """Decode the rows in `[start, stop)` into a list of TaskRecords."""
+        return [self[row] for row in range(*slice(start, stop).indices(self.count))]
+
+    def is_current(self):
+        """True if the database still holds exactly the tasks in this snapshot."""
+        with engine.connect() as connection:
+            with connection.begin():
+                return _stamp(connection) == (self.seq, self.count)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        # Views into the map must go before the map itself can close
+        self._columns = {}
+        self._titles = None
+        self._map.close()
+        self._file.close()
+
+
+def open_snapshot(filename=SNAPSHOT_FILE):
+    """Map `filename`, or return None if it is missing or unreadable."""
+    if filename is None:
+        return None
+    try:
+        file = open(filename, "rb")
+    except OSError:
+        return None
+    try:
+        return Snapshot(file)
+    except (ValueError, struct.error, OSError):
+        file.close()
+        return None
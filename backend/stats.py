@@ -0,0 +1,147 @@
+"""
+Task statistics computed with aggregate SQL.
+
+`get_task_stats()` answers everything with two GROUP BY queries. The first is
+a covering scan of the (completed, priority, deadline) index; the second
+reads only upcoming pending deadlines through the (completed, deadline)
+index. No task rows are loaded into Python. Results are served from the
+query cache until the next write.
+"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import and_, case, func, select
+
+from backend import database
+from backend.cache import cached_query
+from backend.database import DUE_SOON_DAYS, PRIORITIES, Task, engine
+from backend.instrumentation import instrumented
+
+BURNDOWN_DAYS = 14
+
+
+def _count_where(*conditions):
+    return func.coalesce(func.sum(case((and_(*conditions), 1), else_=0)), 0)
+
+
+@cached_query(database.query_cache, database.get_table_version)
+def _task_stats(today, burndown_days):
+    pending = Task.completed.is_(False)
+    soon = today + timedelta(days=DUE_SOON_DAYS)
+    end = today + timedelta(days=burndown_days)
+
+    by_priority_statement = select(
+        Task.priority,
+        func.count(),
+        _count_where(Task.completed.is_(True)),
+        _count_where(pending, Task.deadline < today),
+        _count_where(pending, Task.deadline >= today, Task.deadline < soon),
+    ).group_by(Task.priority)
+    due_per_day_statement = (
+        select(Task.deadline, func.count())
+        .where(pending, Task.deadline >= today, Task.deadline < end)
+        .group_by(Task.deadline)
+    )
+    with engine.connect() as connection:
+        rows = connection.execute(by_priority_statement).all()
+        due_per_day = dict(connection.execute(due_per_day_statement).all())
+
+    by_priority = {
+        priority: {"total": 0, "completed": 0, "pending": 0} for priority in PRIORITIES
+    }
+    total = completed = overdue = due_soon = 0
+    for priority, count, done, late, upcoming in rows:
+        counts = by_priority.setdefault(
+            priority, {"total": 0, "completed": 0, "pending": 0}
+        )
+        counts.update(total=count, completed=done, pending=count - done)
+        total += count
+        completed += done
+        overdue += late
+        due_soon += upcoming
+
+    burndown = _burndown(
+        total - completed,
+        overdue,
+        [
+            {"date": day.isoformat(), "due": due_per_day.get(day, 0)}
+            for day in (today + timedelta(days=n) for n in range(burndown_days))
+        ],
+    )
+
+    return {
+        "total": total,
+        "completed": completed,
+        "pending": total - completed,
+        "completion_rate": round(completed / total, 4) if total else 0.0,
+        "overdue": overdue,
+        "due_soon": due_soon,
+        "by_priority": by_priority,
+        "burndown": burndown,
+    }
+
+
+def _burndown(pending, overdue, burndown):
+    # Pending tasks left after each day if every task is done on its deadline;
+    # overdue tasks are already behind, undated ones never burn down
+    remaining = pending - overdue
+    for day in burndown:
+        remaining -= day["due"]
+        day["remaining"] = remaining
+    return burndown
+
+
+def apply_task_changes(stats, removed=(), added=(), today=None):
+    """
+    Return `stats` (as from `get_task_stats(today)`) updated for a write
+    that replaced the live tasks `removed` with `added`, both TaskRecords:
+    an add has no `removed`, a delete no `added`, and a completion removes
+    the old record and adds the new one. Costs O(changed tasks), not a query.
+    """
+    today = today or date.today()
+    soon = today + timedelta(days=DUE_SOON_DAYS)
+    stats = {
+        **stats,
+        "by_priority": {
+            priority: dict(counts) for priority, counts in stats["by_priority"].items()
+        },
+        "burndown": [dict(day) for day in stats["burndown"]],
+    }
+    days = {day["date"]: day for day in stats["burndown"]}
+
+    for sign, tasks in ((-1, removed), (1, added)):
+        for task in tasks:
+            done = bool(task.completed)
+            counts = stats["by_priority"].setdefault(
+                task.priority, {"total": 0, "completed": 0, "pending": 0}
+            )
+            counts["total"] += sign
+            counts["completed" if done else "pending"] += sign
+            stats["total"] += sign
+            stats["completed" if done else "pending"] += sign
+            if done or task.deadline is None:
+                continue
+            if task.deadline < today:
+                stats["overdue"] += sign
+            elif task.deadline < soon:
+                stats["due_soon"] += sign
+            day = days.get(task.deadline.isoformat())
+            if day is not None:
+                day["due"] += sign
+
+    total, completed = stats["total"], stats["completed"]
+    stats["completion_rate"] = round(completed / total, 4) if total else 0.0
+    _burndown(stats["pending"], stats["overdue"], stats["burndown"])
+    return stats
+
+
+@instrumented
+def get_task_stats(today=None, burndown_days=BURNDOWN_DAYS):
+    """
+    Summarize the live tasks as a JSON-serializable dict: `total`,
+    `completed`, `pending`, `completion_rate`, `overdue`, `due_soon`,
+    `by_priority` (priority -> total/completed/pending) and `burndown`, one
+    entry per day from `today` with the pending tasks `due` that day and
+    those `remaining` after it.
+    """
+    return _task_stats(today or date.today(), burndown_days)
@@ -0,0 +1,190 @@
+import json
+import re
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import select
+
+from backend.database import (
+    ARCHIVE_COLUMNS,
+    ArchivedTask,
+    Task,
+    TaskRecord,
+    engine,
+    merge_tasks,
+    select_records,
+)
+from backend.models import parse_deadline
+from backend.utils import task_to_dict
+
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 500
+
+# Returned by import_tasks: tasks added, and existing tasks whose priority or
+# completion state the import changed
+ImportResult = namedtuple("ImportResult", ["added", "updated"])
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def _iter_rows(batch_size, include_archived):
+    """(TaskRecord, content_hash) pairs in the order `iter_tasks` yields them."""
+    statements = [select_records().add_columns(Task.content_hash).order_by(Task.id)]
+    if include_archived:
+        statements.append(
+            select(*ARCHIVE_COLUMNS, ArchivedTask.content_hash).order_by(
+                ArchivedTask.id
+            )
+        )
+    with engine.connect() as connection:
+        for statement in statements:
+            result = connection.execution_options(yield_per=batch_size).execute(
+                statement
+            )
+            for *values, content_hash in result:
+                yield TaskRecord._make(values), content_hash
+
+
+def iter_tasks(batch_size=EXPORT_BATCH_SIZE, include_archived=False):
+    """
+    Stream every task from the database in id order, followed by the archived
+    tasks if `include_archived` is set.
+    Rows are fetched `batch_size` at a time so memory stays flat.
+    """
+    for task, _ in _iter_rows(batch_size, include_archived):
+        yield task
+
+
+def export_tasks_ndjson(
+    filename, progress=None, batch_size=EXPORT_BATCH_SIZE, include_archived=False
+):
+    """
+    Write all tasks to `filename` as newline-delimited JSON, one task per line.
+    Archived tasks are written too when `include_archived` is set.
+    `progress` is called with the running count after every batch.
+    Returns the number of tasks written.
+    """
+    count = 0
+    with open(filename, "w", encoding="utf-8") as file:
+        for task, content_hash in _iter_rows(batch_size, include_archived):
+            record = task_to_dict(task, content_hash)
+            file.write(json.dumps(record, ensure_ascii=False))
+            file.write("\n")
+            count += 1
+            if progress and count % batch_size == 0:
+                progress(count)
+
+    if progress:
+        progress(count)
+    return count
+
+
+def _iter_json_array(file, chunk_size=65536):
+    """Incrementally decode the objects of a top-level JSON array."""
+    decoder = json.JSONDecoder()
+    buffer = file.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise json.JSONDecodeError("Expected a JSON array", buffer, 0)
+    position = 1
+    eof = False
+
+    while True:
+        position = _SEPARATORS.match(buffer, position).end()
+        if buffer.startswith("]", position):
+            return
+        try:
+            record, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # The next record is incomplete: drop what was consumed, read more
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield record
+
+
+def iter_task_records(file):
+    """
+    Yield task dicts from an open export file, parsing as it reads.
+    Handles both NDJSON exports and the older indented JSON array format.
+    """
+    first = file.read(1)
+    while first.isspace():
+        first = file.read(1)
+    file.seek(0)
+    if first == "[":
+        yield from _iter_json_array(file)
+        return
+
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def parse_completed_at(value):
+    """Read an exported completion time, or None if missing/invalid."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _import_batch(batch):
+    """Merge one batch of records into the database; see `merge_tasks`."""
+    return merge_tasks(
+        {
+            "title": record["title"],
+            "priority": record.get("priority", 1),
+            "completed": bool(record.get("completed", False)),
+            "deadline": parse_deadline(record.get("deadline")),
+            "completed_at": parse_completed_at(record.get("completed_at")),
+            # None in older files: merge_tasks then hashes title and deadline
+            "content_hash": (
+                record.get("content_hash")
+                if isinstance(record.get("content_hash"), str)
+                else None
+            ),
+        }
+        for record in batch
+    )
+
+
+def import_tasks(filename, progress=None, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Merge the tasks of an export file into the database. Tasks are matched by
+    their exported content_hash, or by title and deadline in older files
+    without it: new ones are added, matching ones take the file's priority
+    and completion state, and archived ones are left alone, so importing the
+    same file twice changes nothing.
+    Records are parsed incrementally and merged `batch_size` at a time, each
+    batch with one statement in its own transaction; `progress` is called
+    with (records read, tasks added) after every batch.
+    Returns an ImportResult with the number of tasks added and changed.
+    """
+    read = added = updated = 0
+    batch = []
+    with open(filename, "r", encoding="utf-8") as file:
+        for record in iter_task_records(file):
+            read += 1
+            if record.get("title"):
+                batch.append(record)
+            if len(batch) >= batch_size:
+                batch_added, batch_updated = _import_batch(batch)
+                added += batch_added
+                updated += batch_updated
+                batch = []
+                if progress:
+                    progress(read, added)
+
+    if batch:
+        batch_added, batch_updated = _import_batch(batch)
+        added += batch_added
+        updated += batch_updated
+    if progress:
+        progress(read, added)
+    return ImportResult(added, updated)
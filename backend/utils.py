@@ -1,11 +1,29 @@
-from backend.database import get_all_tasks
+from backend.database import get_tasks_page, parse_order_by, search_terms
 
 
-def filter_tasks(tasks, completed=None, priority=None):
+class _Descending:
+    """Wraps a sort value so that it compares in reverse order."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def filter_tasks(tasks=None, completed=None, priority=None):
     """
     Filter tasks based on completed status (True/False) and priority (1, 2, 3).
-    Uses the `filter` function for functional programming.
+    Without an explicit `tasks` list the filter runs as a WHERE clause in SQL.
     """
+    if tasks is None:
+        return get_tasks_page({"completed": completed, "priority": priority})
+
     return list(
         filter(
             lambda task: (completed is None or task.completed == completed)
@@ -15,11 +33,14 @@ def filter_tasks(tasks, completed=None, priority=None):
     )
 
 
-def sort_tasks(tasks, key="priority", reverse=False):
+def sort_tasks(tasks=None, key="priority", reverse=False):
     """
     Sort tasks based on a given key (priority or title).
-    Uses the `sorted` function with a lambda key.
+    Without an explicit `tasks` list the sort runs as an ORDER BY in SQL.
     """
+    if tasks is None:
+        return get_tasks_page(order_by=f"-{key}" if reverse else key)
+
     return sorted(tasks, key=lambda task: getattr(task, key), reverse=reverse)
 
 
@@ -31,3 +52,70 @@ def format_tasks(tasks):
         f"Task {task.id}: {task.title} (Priority: {task.priority}) - Completed: {task.completed}"
         for task in tasks
     ]
+
+
+def task_to_dict(task, content_hash=None):
+    """
+    Plain, JSON-serializable representation of a task. Exports pass the
+    task's `content_hash` too, so an import can match it exactly.
+    """
+    data = {
+        "id": task.id,
+        "title": task.title,
+        "priority": task.priority,
+        "completed": task.completed,
+        "deadline": task.deadline.isoformat() if task.deadline else None,
+        "completed_at": (
+            task.completed_at.isoformat(timespec="seconds")
+            if task.completed_at
+            else None
+        ),
+    }
+    if content_hash is not None:
+        data["content_hash"] = content_hash
+    return data
+
+
+def task_sort_key(order_by):
+    """
+    Build a key function that orders tasks exactly like `get_tasks_page` does
+    for the same `order_by`, so loaded rows can be searched with `bisect`.
+    """
+    ordering = parse_order_by(order_by)
+
+    def key(task):
+        parts = []
+        for name, descending in ordering:
+            value = getattr(task, name)
+            value = (value is not None, value)  # SQLite sorts NULL first
+            parts.append(_Descending(value) if descending else value)
+        return tuple(parts)
+
+    return key
+
+
+def matches_filters(task, filters):
+    """Check a single task against a `get_tasks_page` filters dict."""
+    filters = filters or {}
+    if filters.get("completed") is not None and task.completed != filters["completed"]:
+        return False
+    if filters.get("priority") is not None and task.priority != filters["priority"]:
+        return False
+    if filters.get("due_from") is not None or filters.get("due_before") is not None:
+        if task.deadline is None:
+            return False
+        if filters.get("due_from") is not None and task.deadline < filters["due_from"]:
+            return False
+        if (
+            filters.get("due_before") is not None
+            and task.deadline >= filters["due_before"]
+        ):
+            return False
+    if filters.get("search"):
+        # Same rule as the full-text index: every search word prefixes a title word
+        title_words = search_terms(task.title)
+        return all(
+            any(word.startswith(term) for word in title_words)
+            for term in search_terms(filters["search"])
+        )
+    return True
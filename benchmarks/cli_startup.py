@@ -0,0 +1,83 @@
+"""
+Cold-start budget check for the command line interface.
+
+Runs `main.py` as a fresh process several times per command (in a scratch
+directory with its own tasks.db) and compares the median wall time with the
+budget below. Exits non-zero when a command is over budget or when a
+database-free command imported SQLAlchemy or Qt.
+
+    python benchmarks/cli_startup.py [--runs 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MAIN = os.path.join(ROOT, "main.py")
+
+# Median milliseconds per invocation. `--help` is interpreter startup plus
+# argparse (~60 ms measured); commands that touch the database are dominated
+# by importing SQLAlchemy (~650 ms measured in total, ~400 ms of it the
+# import). Scripts issuing many commands should use `main.py batch`, which
+# pays that once.
+BUDGET_MS = {
+    ("--help",): 100,
+    ("add", "budget check"): 750,
+    ("list", "--limit", "20"): 750,
+    ("stats",): 750,
+}
+
+IMPORT_CHECK = (
+    "import sys, main; main.build_parser(); "
+    "leaked = [m for m in ('sqlalchemy', 'PySide6') if m in sys.modules]; "
+    "sys.exit(f'imported at startup: {leaked}' if leaked else 0)"
+)
+
+
+def time_command(argv, runs, cwd):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, MAIN, *argv],
+            cwd=cwd,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    failed = False
+    check = subprocess.run(
+        [sys.executable, "-c", IMPORT_CHECK], cwd=ROOT, capture_output=True, text=True
+    )
+    if check.returncode:
+        print(check.stderr.strip())
+        failed = True
+
+    with tempfile.TemporaryDirectory() as scratch:
+        time_command(["--help"], 1, scratch)  # Warm the OS file cache
+        for argv, budget in BUDGET_MS.items():
+            median = time_command(argv, args.runs, scratch)
+            over = median > budget
+            failed |= over
+            print(
+                f"{' '.join(argv):<20} {median:8.1f} ms  "
+                f"(budget {budget} ms){'  OVER BUDGET' if over else ''}"
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Load test for the HTTP API (backend/server.py) on localhost.
+
+Starts a server in-process against a scratch tasks.db (or targets an already
+running one with --port), then runs concurrent keep-alive clients that poll
+GET /tasks with If-None-Match and occasionally add or complete a task.
+Prints throughput, latency percentiles and how many polls were served 304.
+
+    python benchmarks/load_test.py --clients 32 --duration 10 --seed 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+async def request(reader, writer, method, path, body=None, headers=None):
+    payload = json.dumps(body).encode() if body is not None else b""
+    head = [f"{method} {path} HTTP/1.1", "Host: localhost"]
+    head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    head.append(f"Content-Length: {len(payload)}")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+    await writer.drain()
+
+    status_line = (await reader.readline()).split()
+    if len(status_line) < 2:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line[1])
+    response_headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        response_headers[name.strip().lower()] = value.strip()
+    length = int(response_headers.get("content-length", 0))
+    data = await reader.readexactly(length) if length else b""
+    return status, response_headers, data
+
+
+async def client(port, deadline, write_ratio, results):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    etag = None
+    try:
+        while time.perf_counter() < deadline:
+            try:
+                etag = await client_request(reader, writer, write_ratio, etag, results)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Count the dropped request as an error and carry on
+                results["errors"] += 1
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    finally:
+        writer.close()
+
+
+async def client_request(reader, writer, write_ratio, etag, results):
+    """Send one random request and record it; returns the latest ETag."""
+    start = time.perf_counter()
+    if random.random() < write_ratio:
+        if random.random() < 0.5:
+            status, _, _ = await request(
+                reader,
+                writer,
+                "POST",
+                "/tasks",
+                {"title": f"load {random.random():.6f}", "priority": 2},
+            )
+        else:
+            task_id = random.randint(1, 1000)
+            status, _, _ = await request(
+                reader,
+                writer,
+                "PATCH",
+                f"/tasks/{task_id}",
+                {"completed": True},
+            )
+        results["writes"].append(time.perf_counter() - start)
+    else:
+        headers = {"If-None-Match": etag} if etag else {}
+        status, response_headers, _ = await request(
+            reader, writer, "GET", "/tasks?limit=50", headers=headers
+        )
+        etag = response_headers.get("etag", etag)
+        results["reads"].append(time.perf_counter() - start)
+        results["not_modified"] += status == 304
+    results["errors"] += status >= 500
+    return etag
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+async def run(args):
+    server = None
+    if args.port is None:
+        from backend.database import add_tasks_bulk, count_tasks
+        from backend.server import TaskServer
+
+        if args.seed and count_tasks() < args.seed:
+            add_tasks_bulk(
+                {"title": f"seed task {i}", "priority": i % 3 + 1}
+                for i in range(args.seed)
+            )
+        server = await TaskServer(port=0).start()
+        serving = asyncio.create_task(server.serve_forever())
+        port = server.port
+    else:
+        port = args.port
+
+    results = {"reads": [], "writes": [], "not_modified": 0, "errors": 0}
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(
+        *(
+            client(port, deadline, args.write_ratio, results)
+            for _ in range(args.clients)
+        )
+    )
+
+    if server is not None:
+        serving.cancel()
+        await server.close()
+
+    total = len(results["reads"]) + len(results["writes"])
+    print(f"requests     {total} in {args.duration}s ({total / args.duration:.0f}/s)")
+    for kind in ("reads", "writes"):
+        samples = [sample * 1000 for sample in results[kind]]
+        if samples:
+            print(
+                f"{kind:<12} n={len(samples)} p50={statistics.median(samples):.2f}ms "
+                f"p95={percentile(samples, 0.95):.2f}ms "
+                f"p99={percentile(samples, 0.99):.2f}ms"
+            )
+    print(f"304 replies  {results['not_modified']} of {len(results['reads'])} polls")
+    print(f"errors       {results['errors']} (5xx or dropped connections)")
+    return 1 if results["errors"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=1000, help="tasks to pre-create")
+    parser.add_argument("--port", type=int, help="load an already running server")
+    args = parser.parse_args()
+
+    if args.port is None:
+        # The backend opens tasks.db relative to the working directory
+        sys.path.insert(0, ROOT)
+        with tempfile.TemporaryDirectory() as scratch:
+            os.chdir(scratch)
+            return asyncio.run(run(args))
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
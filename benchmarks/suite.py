@@ -0,0 +1,344 @@
+"""
+Reproducible benchmark suite for the backend and GUI hot paths.
+
+Each dataset size runs in a fresh interpreter inside a scratch directory, so
+it gets its own tasks.db and cold module state. The seeded data is
+deterministic. Results are written as JSON so runs from two commits can be
+compared:
+
+    python benchmarks/suite.py run --sizes 1000,100000,1000000 -o before.json
+    python benchmarks/suite.py run -o after.json
+    python benchmarks/suite.py compare before.json after.json
+
+`--storage` selects the backend (TODO_STORAGE, see backend/config.py).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import count, islice
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+SEED = 42
+SEED_BATCH = 50_000
+WRITE_OPS = 50  # Single-row writes timed per run; reported per operation
+
+WORDS = (
+    "buy call email fix plan review write read clean book pay send update "
+    "prepare check order schedule report groceries invoice meeting garden "
+    "car doctor taxes project slides budget kitchen friend birthday"
+).split()
+
+
+def seed_tasks(size):
+    """Yield `size` deterministic synthetic tasks."""
+    rng = random.Random(SEED)
+    start = datetime.date(2025, 1, 1)
+    for i in range(size):
+        deadline = None
+        if rng.random() < 0.8:
+            deadline = (
+                start + datetime.timedelta(days=rng.randint(-60, 120))
+            ).isoformat()
+        yield {
+            "title": f"{' '.join(rng.choices(WORDS, k=3))} {i}",
+            "priority": rng.randint(1, 3),
+            "completed": rng.random() < 0.3,
+            "deadline": deadline,
+        }
+
+
+def measure(func, setup=None, repeat=5, time_budget=2.0, ops=1):
+    """
+    Time `func` up to `repeat` times (fewer once `time_budget` seconds are
+    spent) and return min/median milliseconds, divided by `ops` when one run
+    performs several operations.
+    """
+    samples = []
+    spent = 0.0
+    while len(samples) < repeat and (not samples or spent < time_budget):
+        arguments = (setup(),) if setup else ()
+        start = time.perf_counter()
+        func(*arguments)
+        elapsed = time.perf_counter() - start
+        spent += elapsed
+        samples.append(elapsed * 1000 / ops)
+    return {
+        "min_ms": round(min(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "runs": len(samples),
+        "ops_per_run": ops,
+    }
+
+
+def run_size(size, repeat):
+    """Benchmark one dataset size in the current directory. Runs in a child."""
+    from backend import database, utils
+    from backend.transfer import export_tasks_ndjson, import_tasks
+
+    results = {}
+    rng = random.Random(SEED)
+
+    def seed():
+        start = time.perf_counter()
+        batch = []
+        for task in seed_tasks(size):
+            batch.append(task)
+            if len(batch) == SEED_BATCH:
+                database.add_tasks_bulk(batch)
+                batch = []
+        database.add_tasks_bulk(batch)
+        return {"seconds": round(time.perf_counter() - start, 3)}
+
+    results["seed"] = seed()
+
+    def cold(func):
+        # Measure the database, not the query cache
+        def run():
+            database.query_cache.invalidate()
+            return func()
+
+        return run
+
+    results["get_all_tasks"] = measure(cold(database.get_all_tasks), repeat=repeat)
+    results["get_tasks_page"] = measure(
+        cold(lambda: database.get_tasks_page(order_by="-priority", limit=200)),
+        repeat=repeat,
+    )
+    results["sort_tasks"] = measure(
+        cold(lambda: utils.sort_tasks(key="title")), repeat=repeat
+    )
+    results["filter_tasks"] = measure(
+        cold(lambda: utils.filter_tasks(completed=False, priority=3)), repeat=repeat
+    )
+    all_tasks = database.get_all_tasks()
+    results["format_tasks"] = measure(
+        lambda: utils.format_tasks(all_tasks), repeat=repeat
+    )
+
+    live_ids = list(range(1, size + 1))
+
+    def pick_ids():
+        return rng.sample(live_ids, min(WRITE_OPS, len(live_ids)))
+
+    def pick_ids_to_delete():
+        picked = pick_ids()
+        for task_id in picked:
+            live_ids.remove(task_id)
+        return picked
+
+    added = count()
+
+    def add_many():
+        # A fresh title every time, so each run times plain inserts
+        for i in islice(added, WRITE_OPS):
+            database.add_task(f"benchmark task {i}", 2, "2025-06-01")
+
+    def complete_many(task_ids):
+        for task_id in task_ids:
+            database.mark_task_complete(task_id)
+
+    def delete_many(task_ids):
+        for task_id in task_ids:
+            database.delete_task(task_id)
+
+    results["add_task"] = measure(add_many, repeat=repeat, ops=WRITE_OPS)
+    results["mark_task_complete"] = measure(
+        complete_many, setup=pick_ids, repeat=repeat, ops=WRITE_OPS
+    )
+    results["delete_task"] = measure(
+        delete_many, setup=pick_ids_to_delete, repeat=repeat, ops=WRITE_OPS
+    )
+
+    export_file = os.path.abspath("export.ndjson")
+    results["save_ndjson"] = measure(
+        lambda: export_tasks_ndjson(export_file), repeat=repeat
+    )
+
+    results["gui_update_task_list"] = measure_gui(repeat)
+
+    results["clear_all_tasks"] = measure(database.clear_all_tasks, repeat=1)
+    results["load_ndjson"] = measure(
+        lambda _: import_tasks(export_file),
+        setup=database.clear_all_tasks,  # Import into an empty table each run
+        repeat=min(repeat, 2),
+    )
+    return results
+
+
+def measure_gui(repeat):
+    """Time ToDoApp.update_task_list until the first chunk is shown and painted."""
+    from backend import database
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtWidgets import QApplication
+
+        app = QApplication.instance() or QApplication([])
+        from frontend.gui import ToDoApp
+    except ImportError as error:
+        return {"skipped": f"GUI unavailable: {error}"}
+
+    window = ToDoApp()
+    window.show()
+
+    def refresh():
+        database.query_cache.invalidate()  # Like cold(): time the database
+        window.update_task_list()
+        model = window.task_model
+        while model.canFetchMore() or model._fetching:
+            app.processEvents()
+            if model.rowCount():
+                break
+        window.grab()  # Paint the visible rows offscreen
+
+    result = measure(refresh, repeat=repeat)
+    window.worker.wait()
+    window.close()
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cmd_run(args):
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "repeat": args.repeat,
+            "storage": args.storage,
+        },
+        "results": {},
+    }
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        QT_QPA_PLATFORM="offscreen",
+        TODO_STORAGE=args.storage,
+    )
+
+    for size in sizes:
+        print(f"Benchmarking {size} tasks...", file=sys.stderr)
+        with tempfile.TemporaryDirectory() as scratch:
+            child = subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "_child",
+                    str(size),
+                    "--repeat",
+                    str(args.repeat),
+                ],
+                cwd=scratch,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+        if child.returncode:
+            sys.stderr.write(child.stderr)
+            return child.returncode
+        report["results"][str(size)] = json.loads(child.stdout.splitlines()[-1])
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_child(args):
+    sys.path.insert(0, ROOT)
+    print(json.dumps(run_size(args.size, args.repeat)))
+    return 0
+
+
+def cmd_compare(args):
+    with open(args.base) as file:
+        base = json.load(file)
+    with open(args.head) as file:
+        head = json.load(file)
+
+    regressions = 0
+    for size, benchmarks in head["results"].items():
+        for name, result in benchmarks.items():
+            before = base["results"].get(size, {}).get(name, {})
+            if "median_ms" not in result or "median_ms" not in before:
+                continue
+            ratio = (
+                result["median_ms"] / before["median_ms"]
+                if before["median_ms"]
+                else 1.0
+            )
+            flag = ""
+            if ratio > 1 + args.threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            elif ratio < 1 - args.threshold:
+                flag = "  faster"
+            print(
+                f"{size:>8} {name:<22} {before['median_ms']:>11.3f} ms -> "
+                f"{result['median_ms']:>11.3f} ms  x{ratio:.2f}{flag}"
+            )
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite and write JSON results")
+    run.add_argument(
+        "--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma separated"
+    )
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument(
+        "--storage",
+        choices=("sqlite", "sqlite-defaults", "memory"),
+        default="sqlite",
+        help="storage backend to benchmark",
+    )
+    run.add_argument("-o", "--output", default="bench_results.json")
+    run.set_defaults(handler=cmd_run)
+
+    child = commands.add_parser("_child")
+    child.add_argument("size", type=int)
+    child.add_argument("--repeat", type=int, default=5)
+    child.set_defaults(handler=cmd_child)
+
+    compare = commands.add_parser("compare", help="compare two result files")
+    compare.add_argument("base")
+    compare.add_argument("head")
+    compare.add_argument(
+        "--threshold", type=float, default=0.10, help="relative change to flag"
+    )
+    compare.set_defaults(handler=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+from PySide6.QtWidgets import (
+    QDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+from PySide6.QtCore import QTimer
+
+from backend import database, instrumentation
+
+COLUMNS = ["Operation", "Count", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Rows"]
+SUMMARY_FIELDS = ["count", "p50_ms", "p95_ms", "p99_ms", "max_ms", "rows"]
+REFRESH_MS = 1000
+
+
+class DiagnosticsDialog(QDialog):
+    """Hidden panel (Ctrl+Shift+D) showing the instrumentation histograms"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(760, 420)
+
+        self.status_label = QLabel()
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+
+        self.toggle_button = QPushButton()
+        self.toggle_button.clicked.connect(self.toggle_recording)
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        dump_button = QPushButton("Dump to JSON...")
+        dump_button.clicked.connect(self.dump)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.toggle_button)
+        buttons.addWidget(reset_button)
+        buttons.addStretch()
+        buttons.addWidget(dump_button)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+
+        # Only refreshes while the panel is open
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start(REFRESH_MS)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        enabled = instrumentation.is_enabled()
+        self.toggle_button.setText("Stop recording" if enabled else "Start recording")
+        cache = database.query_cache.stats()
+        status = (
+            f"Recording: {'on' if enabled else 'off'}   "
+            f"Query cache: {cache['hits']} hits, {cache['misses']} misses, "
+            f"{cache['entries']}/{cache['max_entries']} entries"
+        )
+        if database.write_behind is not None:
+            writes = database.write_behind.stats()
+            status += (
+                f"\nWrite-behind: {writes['operations']} writes in "
+                f"{writes['batches']} commits (mean batch "
+                f"{writes['mean_batch_size']}, max {writes['max_batch_size']}), "
+                f"commit p50 {writes['commit_p50_ms']} ms, "
+                f"p95 {writes['commit_p95_ms']} ms, {writes['pending']} pending"
+            )
+        self.status_label.setText(status)
+
+        summaries = instrumentation.snapshot()
+        self.table.setRowCount(len(summaries))
+        for row, (name, summary) in enumerate(summaries.items()):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            for column, field in enumerate(SUMMARY_FIELDS, start=1):
+                self.table.setItem(row, column, QTableWidgetItem(str(summary[field])))
+
+    def toggle_recording(self):
+        if instrumentation.is_enabled():
+            instrumentation.disable()
+        else:
+            instrumentation.enable(database.engine)
+        self.refresh()
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def dump(self):
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Save diagnostics", "diagnostics.json", "JSON files (*.json)"
+        )
+        if filename:
+            instrumentation.dump(filename)
@@ -1,7 +1,7 @@
 import sys
 import os
 import json
-import winreg
+import time
 
 # Add the parent directory (ToDoListApp) to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -11,24 +11,45 @@ from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QLineEdit,
     QComboBox,
     QMessageBox,
     QDateEdit,
     QHeaderView,
+    QProgressDialog,
+    QCheckBox,
 )
-from PySide6.QtGui import QColor
-from PySide6.QtCore import QFile, QTimer, QDate
+from PySide6.QtCore import QFile, QTimer, QDate, Qt
+from PySide6.QtGui import QKeySequence, QShortcut
+from backend import instrumentation
 from backend.database import (
-    add_task,
-    get_all_tasks,
-    mark_task_complete,
-    delete_task,
+    ARCHIVE_AFTER_DAYS,
+    archive_completed_tasks,
+    due_soon_filters,
+    enable_write_behind,
+    overdue_filters,
     clear_all_tasks,
 )
-from backend.utils import sort_tasks, format_tasks
+from backend.changes import ChangeFeed
+from backend.snapshot import (
+    SNAPSHOT_ORDER,
+    discard_snapshot,
+    open_snapshot,
+    write_snapshot,
+)
+from backend.transfer import export_tasks_ndjson, import_tasks
+from frontend.diagnostics import DiagnosticsDialog
+from frontend.next_up import NextUpList
+from frontend.stats_panel import StatsPanel
+from frontend.task_model import TaskTableModel
+from frontend.theme import ThemeManager
+from frontend.worker import DatabaseWorker
+
+EXPORT_FILENAME = "tasks.ndjson"
+LEGACY_EXPORT_FILENAME = "tasks.json"  # Indented JSON written by older versions
+SEARCH_DEBOUNCE_MS = 250
+CHANGE_POLL_MS = 1000  # How often to look for changes made by other instances
 
 
 class ToDoApp(QWidget):
@@ -39,144 +60,28 @@ class ToDoApp(QWidget):
         self.setWindowTitle("To-Do List Manager")
         self.setGeometry(200, 200, 800, 600)  # Increased size for better layout
         self.setMinimumSize(800, 600)  # Prevents the window from becoming too small
-        self.dark_mode = self.is_windows_dark_mode()
-        self.apply_theme()
+        # Edits are group-committed in the background; worker jobs flush first
+        self.writes = enable_write_behind()
+        self.worker = DatabaseWorker(self, writes=self.writes)
+        self.worker.failed.connect(self.show_error)
         self.initUI()
-
-        self.theme_timer = QTimer(self)
-        self.theme_timer.timeout.connect(self.check_theme_update)
-        self.theme_timer.start(3000)
-
-    def check_theme_update(self):
-        current_mode = self.is_windows_dark_mode()
-        if current_mode != self.dark_mode:
-            self.dark_mode = current_mode
-            self.apply_theme()
-
-    def apply_theme(self):
-        """Apply consistent dark or light mode styling throughout the application"""
-        if self.is_windows_dark_mode():
-            theme_style = """
-                QWidget { background-color: #2E2E2E; color: white; }
-
-                QPushButton {
-                    background-color: #444; 
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px;
-                    font-size: 14px;
-                    border: 1px solid #666;
-                }
-                QPushButton:hover { background-color: #555; }
-                QPushButton:pressed { background-color: #666; }
-                QPushButton#delete_task_button { background-color: #D9534F; }
-                QPushButton#delete_task_button:hover { background-color: #C9302C; }
-                QPushButton#complete_task_button { background-color: #5CB85C; }
-                QPushButton#complete_task_button:hover { background-color: #4CAE4C; }
-
-                QTableWidget {
-                    background-color: #3A3A3A;
-                    color: white;
-                    gridline-color: #555;
-                    selection-background-color: #555;
-                }
-                QHeaderView::section {
-                    background-color: #444;
-                    padding: 5px;
-                    font-weight: bold;
-                    border: 1px solid #666;
-                }
-
-                QComboBox, QDateEdit, QLineEdit {
-                    background-color: #3A3A3A;
-                    color: white;
-                    border-radius: 6px;
-                    padding: 6px;
-                    border: 1px solid #666;
-                    font-size: 14px;
-                }
-                QComboBox:hover, QDateEdit:hover, QLineEdit:hover { border: 1px solid #888; }
-                QComboBox QAbstractItemView {
-                    background-color: #3A3A3A;
-                    selection-background-color: #555;
-                    border-radius: 6px;
-                }
-                QLineEdit:focus {
-                    border: 2px solid #1DB954;
-                    background-color: #444;
-                }
-            """
-        else:
-            theme_style = """
-                QWidget { background-color: #F5F5F5; color: black; }
-
-                QPushButton {
-                    background-color: #E0E0E0; 
-                    color: black;
-                    border-radius: 8px;
-                    padding: 8px;
-                    font-size: 14px;
-                    border: 1px solid #BDBDBD;
-                }
-                QPushButton:hover { background-color: #D6D6D6; }
-                QPushButton:pressed { background-color: #BDBDBD; }
-                QPushButton#delete_task_button { background-color: #FF6B6B; }
-                QPushButton#delete_task_button:hover { background-color: #FF3B3B; }
-                QPushButton#complete_task_button { background-color: #4CAF50; }
-                QPushButton#complete_task_button:hover { background-color: #45A049; }
-
-                QTableWidget {
-                    background-color: white;
-                    color: black;
-                    gridline-color: #CCC;
-                    selection-background-color: #D6D6D6;
-                }
-                QHeaderView::section {
-                    background-color: #E0E0E0;
-                    padding: 5px;
-                    font-weight: bold;
-                    border: 1px solid #BDBDBD;
-                }
-
-                QComboBox, QDateEdit, QLineEdit {
-                    background-color: #FFFFFF;
-                    color: black;
-                    border-radius: 6px;
-                    padding: 6px;
-                    border: 1px solid #BDBDBD;
-                    font-size: 14px;
-                }
-                QComboBox:hover, QDateEdit:hover, QLineEdit:hover { border: 1px solid #888; }
-                QComboBox QAbstractItemView {
-                    background-color: #F5F5F5;
-                    selection-background-color: #D6D6D6;
-                    border-radius: 6px;
-                }
-                QLineEdit:focus {
-                    border: 2px solid #1DB954;
-                    background-color: #F0F0F0;
-                }
-            """
-
-        self.setStyleSheet(theme_style)
-
-        # Apply the theme to individual widgets if necessary
-        if hasattr(self, "search_bar"):
-            self.search_bar.setStyleSheet(theme_style)
-
-    @staticmethod
-    def is_windows_dark_mode():
-        try:
-            registry = winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER)
-            key = winreg.OpenKey(
-                registry,
-                r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize",
-            )
-            value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
-            winreg.CloseKey(key)
-            return value == 0
-        except:
-            return False
+        # Restyles on platform light/dark changes; no polling
+        self.theme = ThemeManager(self)
+
+        # Pick up tasks changed by other app instances and scripts. The feed
+        # connects on the worker, first thing, so startup never waits on it
+        self.change_feed = ChangeFeed()
+        self.own_changes = {}  # Task id -> what we last wrote, None if deleted
+        self.worker.submit(self.change_feed.open)
+        self.show_initial_tasks()
+        self.refresh_summaries()
+        self.change_timer = QTimer(self)
+        self.change_timer.timeout.connect(self.poll_changes)
+        self.change_timer.start(CHANGE_POLL_MS)
+
+        # Hidden diagnostics panel with the latency histograms
+        self.diagnostics = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.show_diagnostics)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -200,14 +105,23 @@ class ToDoApp(QWidget):
         self.add_task_button.clicked.connect(self.add_task)
         layout.addWidget(self.add_task_button)
 
-        self.task_table = QTableWidget(self)
-        self.task_table.setColumnCount(5)  # Ensure 5 columns including Deadline
-        self.task_table.setHorizontalHeaderLabels(
-            ["ID", "Title", "Priority", "Status", "Deadline"]
-        )
-        self.task_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.task_model = TaskTableModel(self.worker, self)
+        self.task_table = QTableView(self)
+        self.task_table.setModel(self.task_model)
+        self.task_table.setSelectionBehavior(QTableView.SelectRows)
+        self.task_table.setSelectionMode(QTableView.ExtendedSelection)
+        self.task_table.verticalHeader().hide()
         layout.addWidget(self.task_table)
 
+        # Counts and deadlines: aggregated in SQL once, then kept up to date
+        # from the app's own writes
+        self.stats_panel = StatsPanel(self.worker, self)
+        layout.addWidget(self.stats_panel)
+
+        # Most urgent pending tasks, from a top-K query rather than the table
+        self.next_up = NextUpList(self.worker, self)
+        layout.addWidget(self.next_up)
+
         self.complete_task_button = QPushButton("Mark as Completed", self)
         self.complete_task_button.clicked.connect(self.mark_task_complete)
         layout.addWidget(self.complete_task_button)
@@ -223,6 +137,12 @@ class ToDoApp(QWidget):
         self.sort_dropdown.currentIndexChanged.connect(self.update_task_list)
         layout.addWidget(self.sort_dropdown)
 
+        # Deadline views, answered by range scans on the deadline index
+        self.view_dropdown = QComboBox(self)
+        self.view_dropdown.addItems(["All Tasks", "Overdue", "Due This Week"])
+        self.view_dropdown.currentIndexChanged.connect(self.update_task_list)
+        layout.addWidget(self.view_dropdown)
+
         self.save_tasks_button = QPushButton("Save Tasks", self)
         self.save_tasks_button.clicked.connect(self.save_tasks)
         layout.addWidget(self.save_tasks_button)
@@ -235,203 +155,289 @@ class ToDoApp(QWidget):
         self.load_tasks_button.clicked.connect(self.load_tasks)
         layout.addWidget(self.load_tasks_button)
 
+        self.archive_tasks_button = QPushButton("Archive Completed Tasks", self)
+        self.archive_tasks_button.clicked.connect(self.archive_tasks)
+        layout.addWidget(self.archive_tasks_button)
+
+        # History view: also list (and save) archived tasks
+        self.include_archived_checkbox = QCheckBox("Include archived tasks", self)
+        self.include_archived_checkbox.toggled.connect(self.update_task_list)
+        layout.addWidget(self.include_archived_checkbox)
+
         self.search_bar = QLineEdit(self)
         self.search_bar.setPlaceholderText("🔍 Search tasks...")
-        self.search_bar.setStyleSheet(
-            """
-            QLineEdit {
-                background-color: #3A3A3A; /* Dark background */
-                color: white;
-                border: 2px solid #555;
-                border-radius: 8px;
-                padding: 6px;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #1DB954; /* Green border when focused */
-                background-color: #444;
-            }
-        """
-        )
-        self.search_bar.textChanged.connect(self.filter_tasks)
+        # Query the search index once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_tasks)
+        self.search_bar.textChanged.connect(self.search_timer.start)
         layout.addWidget(self.search_bar)
 
         self.setLayout(layout)
-        self.update_task_list()
 
         self.complete_task_button.setObjectName("complete_task_button")
         self.delete_task_button.setObjectName("delete_task_button")
 
         # Set resize mode for all columns to Stretch
         header = self.task_table.horizontalHeader()
-        for i in range(self.task_table.columnCount()):
+        for i in range(self.task_model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
-        # Resize columns to fit the content automatically
-        self.task_table.resizeColumnsToContents()
+    def show_initial_tasks(self):
+        """
+        Paint the tasks saved at the last exit straight from the snapshot file,
+        then check them against the database in the background.
+        """
+        snapshot = open_snapshot()
+        if snapshot is None:
+            self.update_task_list()
+            return
+        with snapshot:
+            first_page = snapshot.records(0, self.task_model.chunk_size)
+        self.task_model.set_query({}, SNAPSHOT_ORDER, first_page=first_page)
+
+        def reconciled(current):
+            if not current:
+                discard_snapshot()
+                self.update_task_list()
 
-    def filter_tasks(self):
-        """Filter tasks based on user input in the search bar."""
-        search_text = self.search_bar.text().strip().lower()
+        self.worker.submit(snapshot.is_current, callback=reconciled)
+
+    def poll_changes(self):
+        """Apply the delta other processes committed since the last poll"""
+        self.worker.submit(
+            self.change_feed.poll, callback=self.apply_changes, key="changes"
+        )
 
-        for row in range(self.task_table.rowCount()):
-            title_item = self.task_table.item(row, 1)  # Title column
-            if title_item:
-                title = title_item.text().strip().lower()
-                self.task_table.setRowHidden(row, search_text not in title)
+    def apply_changes(self, changes):
+        if changes is not None:
+            self.task_model.apply_changes(changes)
+            if self.is_external(changes):
+                self.refresh_summaries()
+
+    def is_external(self, changes):
+        """
+        Whether `changes` hold anything besides our own writes, which the feed
+        reports too but `tasks_changed` already applied. Matched writes are
+        forgotten; a mismatch only costs an extra summary query.
+        """
+        external = changes.reset
+        for task in changes.updated:
+            external |= self.own_changes.pop(task.id, None) != task
+        for task_id in changes.deleted:
+            external |= self.own_changes.pop(task_id, task_id) is not None
+        return external
+
+    def refresh_summaries(self):
+        """Re-query the summary and "Next up", e.g. after an import"""
+        self.stats_panel.schedule_refresh()
+        self.next_up.schedule_refresh()
+
+    def tasks_changed(self, removed=(), added=()):
+        """Fold one of our own committed writes into the summary and "Next up"."""
+        for task in removed:
+            self.own_changes[task.id] = None
+        for task in added:
+            self.own_changes[task.id] = task
+        self.stats_panel.apply_changes(removed, added)
+        self.next_up.schedule_refresh()
+
+    def filter_tasks(self):
+        """Filter tasks through the full-text index based on the search bar."""
+        with instrumentation.timed("gui.filter_tasks"):
+            self.update_task_list()
 
     def add_task(self):
         title = self.task_input.text().strip()
         priority = self.priority_dropdown.currentIndex() + 1
-        deadline = self.deadline_input.date().toString("yyyy-MM-dd")  # Format deadline
+        deadline = self.deadline_input.date().toPython()  # Stored as a date
 
         if title:
-            add_task(title, priority, deadline)  # Pass deadline to database
+
+            def added(task):
+                self.task_model.insert_task(task)
+                self.tasks_changed(added=[task])
+
+            self.worker.watch(
+                self.writes.add_task(title, priority, deadline), callback=added
+            )
             self.task_input.clear()
-            self.update_task_list()
         else:
             QMessageBox.warning(self, "Input Error", "Task title cannot be empty!")
 
     def update_task_list(self):
-        tasks = get_all_tasks()
+        # Not a decorator: Qt would then pass signal arguments through *args
+        with instrumentation.timed("gui.update_task_list"):
+            self._update_task_list()
+
+    def _update_task_list(self):
         sort_index = self.sort_dropdown.currentIndex()
-        sort_key, reverse = (
-            ("priority", True)
+        order_by = (
+            "-priority"
             if sort_index == 0
-            else ("priority", False) if sort_index == 1 else ("title", False)
+            else "priority" if sort_index == 1 else "title"
         )
-        sorted_tasks = sort_tasks(tasks, key=sort_key, reverse=reverse)
-
-        self.task_table.setRowCount(len(sorted_tasks))
-        self.task_table.setColumnCount(5)  # Ensure there are 5 columns now
-        self.task_table.setHorizontalHeaderLabels(
-            ["ID", "Title", "Priority", "Status", "Deadline"]
-        )  # Updated
-
-        for row, task in enumerate(sorted_tasks):
-            self.task_table.setItem(row, 0, QTableWidgetItem(str(task.id)))
-            self.task_table.setItem(row, 1, QTableWidgetItem(task.title))
-            self.task_table.setItem(row, 2, QTableWidgetItem(str(task.priority)))
-
-            # Status Column (Completed or Pending)
-            status_text = "Completed" if task.completed else "Pending"
-            status_item = QTableWidgetItem(status_text)
-            status_item.setForeground(
-                QColor("green") if task.completed else QColor("red")
-            )
-            self.task_table.setItem(row, 3, status_item)
-
-            # Handle Missing or Invalid Deadlines
-            deadline_item = QTableWidgetItem("N/A")  # Default value
-            if task.deadline and isinstance(task.deadline, str):
-                deadline_date = QDate.fromString(
-                    task.deadline, "yyyy-MM-dd"
-                )  # Convert from DB format
-                if deadline_date.isValid():
-                    formatted_deadline = deadline_date.toString(
-                        "dd-MM-yyyy"
-                    )  # Convert to desired format
-                    deadline_item.setText(formatted_deadline)
-
-                    # Apply Color Coding for Deadlines
-                    today = QDate.currentDate()
-                    if deadline_date < today:
-                        deadline_item.setForeground(QColor("red"))  # Overdue
-                    elif deadline_date <= today.addDays(6):
-                        deadline_item.setForeground(QColor("orange"))  # Due soon
-                    else:
-                        deadline_item.setForeground(QColor("green"))  # Safe
-
-            self.task_table.setItem(row, 4, deadline_item)
+        view_index = self.view_dropdown.currentIndex()
+        filters = (
+            overdue_filters()
+            if view_index == 1
+            else due_soon_filters() if view_index == 2 else {}
+        )
+        filters["search"] = self.search_bar.text().strip()
+        if self.include_archived_checkbox.isChecked():
+            filters["include_archived"] = True
+        self.task_model.set_query(filters, order_by)
+
+    def selected_tasks(self):
+        """Return the tasks in the selected rows, by id."""
+        tasks = (
+            self.task_model.task_at(index.row())
+            for index in self.task_table.selectionModel().selectedRows()
+        )
+        return {task.id: task for task in tasks}
 
     def mark_task_complete(self):
-        selected_row = self.task_table.currentRow()
-        if selected_row >= 0:
-            task_id = int(self.task_table.item(selected_row, 0).text())
-            mark_task_complete(task_id)
-            self.update_task_list()
+        selected = self.selected_tasks()
+        if selected:
+
+            def completed(tasks):
+                self.task_model.update_tasks(tasks)
+                self.tasks_changed([selected[task.id] for task in tasks], tasks)
+
+            self.worker.watch(
+                self.writes.mark_tasks_complete(selected), callback=completed
+            )
         else:
             QMessageBox.warning(
-                self, "Selection Error", "Select a task to mark as completed!"
+                self, "Selection Error", "Select tasks to mark as completed!"
             )
 
     def save_tasks(self):
-        """Save tasks to a JSON file"""
-        filename = "tasks.json"
-        tasks = get_all_tasks()
-        task_data = [
-            {
-                "id": task.id,
-                "title": task.title,
-                "priority": task.priority,
-                "completed": task.completed,
-                "deadline": (
-                    QDate.fromString(task.deadline, "yyyy-MM-dd").toString("dd-MM-yyyy")
-                    if task.deadline
-                    else "N/A"
-                ),
-            }
-            for task in tasks
-        ]
-
-        with open(filename, "w") as file:
-            json.dump(task_data, file, indent=4)
-
-        QMessageBox.information(
-            self, "Saved", f"Tasks saved successfully to {filename}!"
+        """Save tasks to an NDJSON file, streaming rows from the database"""
+        filename = EXPORT_FILENAME
+        progress = self.progress_dialog("Saving tasks...")
+        started = time.perf_counter()
+
+        def saved(count):
+            instrumentation.record(
+                "gui.save_tasks", (time.perf_counter() - started) * 1000, count
+            )
+            self.worker.submit(write_snapshot)
+            progress.close()
+            QMessageBox.information(
+                self, "Saved", f"{count} tasks saved successfully to {filename}!"
+            )
+
+        self.worker.submit(
+            export_tasks_ndjson,
+            filename,
+            include_archived=self.include_archived_checkbox.isChecked(),
+            progress=self.worker.relay(
+                lambda written: progress.setLabelText(
+                    f"Saving tasks... ({written} written)"
+                )
+            ),
+            callback=saved,
+            error_callback=lambda error: self.show_error(error, progress),
         )
 
     def load_tasks(self):
-        """Load tasks from a JSON file without duplicating existing ones"""
-        filename = "tasks.json"
-        if not os.path.exists(filename):
-            QMessageBox.warning(self, "Error", f"No saved tasks found in {filename}!")
+        """Load tasks from a saved file without duplicating existing ones"""
+        filename = next(
+            (
+                name
+                for name in (EXPORT_FILENAME, LEGACY_EXPORT_FILENAME)
+                if os.path.exists(name)
+            ),
+            None,
+        )
+        if filename is None:
+            QMessageBox.warning(
+                self, "Error", f"No saved tasks found in {EXPORT_FILENAME}!"
+            )
             return
 
-        try:
-            with open(filename, "r") as file:
-                task_data = json.load(file)
-
-            existing_tasks = {task.title for task in get_all_tasks()}
-            new_tasks = []
-
-            for task in task_data:
-                if task["title"] not in existing_tasks:
-                    # Convert "DD-MM-YYYY" back to "YYYY-MM-DD" before adding to DB
-                    deadline_qdate = QDate.fromString(
-                        task.get("deadline", ""), "dd-MM-yyyy"
-                    )
-                    deadline_str = (
-                        deadline_qdate.toString("yyyy-MM-dd")
-                        if deadline_qdate.isValid()
-                        else None
-                    )
-
-                    add_task(task["title"], task["priority"], deadline_str)
-                    new_tasks.append(task)
-
-            if new_tasks:
+        progress = self.progress_dialog("Loading tasks...")
+        started = time.perf_counter()
+
+        def loaded(result):
+            instrumentation.record(
+                "gui.load_tasks",
+                (time.perf_counter() - started) * 1000,
+                result.added + result.updated,
+            )
+            progress.close()
+            if result.added or result.updated:
                 self.update_task_list()
+                self.refresh_summaries()
                 QMessageBox.information(
-                    self, "Loaded", f"Added {len(new_tasks)} new tasks from {filename}!"
+                    self,
+                    "Loaded",
+                    f"Added {result.added} new tasks and updated {result.updated} "
+                    f"from {filename}!",
+                )
+            else:
+                QMessageBox.information(self, "Loaded", "No new or changed tasks.")
+
+        def failed(error):
+            if isinstance(error, json.JSONDecodeError):
+                progress.close()
+                QMessageBox.warning(
+                    self,
+                    "Error",
+                    f"Failed to read {filename}! File might be corrupted.",
                 )
             else:
-                QMessageBox.information(self, "Loaded", "No new tasks to add.")
+                self.show_error(error, progress)
+
+        self.worker.submit(
+            import_tasks,
+            filename,
+            progress=self.worker.relay(
+                lambda read, added: progress.setLabelText(
+                    f"Loading tasks... ({read} read, {added} added)"
+                )
+            ),
+            callback=loaded,
+            error_callback=failed,
+        )
 
-        except json.JSONDecodeError:
-            QMessageBox.warning(
-                self, "Error", f"Failed to read {filename}! File might be corrupted."
-            )
+    def progress_dialog(self, label):
+        """Open a busy indicator for long-running save/load operations."""
+        progress = QProgressDialog(label, None, 0, 0, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+        return progress
+
+    def show_diagnostics(self):
+        if self.diagnostics is None:
+            self.diagnostics = DiagnosticsDialog(self)
+        self.diagnostics.show()
+        self.diagnostics.raise_()
+
+    def show_error(self, error, progress=None):
+        """Report a failed background database operation."""
+        if progress is not None:
+            progress.close()
+        QMessageBox.warning(self, "Error", f"Database operation failed: {error}")
 
     def delete_task(self):
-        """Delete the selected task from the database"""
-        selected_row = self.task_table.currentRow()
-        if selected_row >= 0:
-            task_id = int(self.task_table.item(selected_row, 0).text())
-            delete_task(task_id)
-            self.update_task_list()
+        """Delete the selected tasks from the database"""
+        selected = self.selected_tasks()
+        if selected:
+
+            def deleted(task_ids):
+                self.task_model.remove_tasks(task_ids)
+                if self.include_archived_checkbox.isChecked():
+                    # Archived rows look like live ones but aren't counted
+                    self.refresh_summaries()
+                else:
+                    self.tasks_changed([selected[task_id] for task_id in task_ids])
+
+            self.worker.watch(self.writes.delete_tasks(selected), callback=deleted)
         else:
-            QMessageBox.warning(self, "Selection Error", "Select a task to delete!")
+            QMessageBox.warning(self, "Selection Error", "Select tasks to delete!")
 
     def clear_all_tasks(self):
         """Clear all tasks from the database and update the UI"""
@@ -444,9 +450,43 @@ class ToDoApp(QWidget):
         )
 
         if confirmation == QMessageBox.Yes:
-            clear_all_tasks()  # Ensure this function is imported from backend.database
+
+            def cleared(_):
+                self.update_task_list()
+                self.refresh_summaries()
+                QMessageBox.information(self, "Cleared", "All tasks have been deleted.")
+
+            # Ensure this function is imported from backend.database
+            self.worker.submit(clear_all_tasks, callback=cleared)
+
+    def archive_tasks(self):
+        """Move old completed tasks out of the main list into the archive"""
+        confirmation = QMessageBox.question(
+            self,
+            "Archive Completed Tasks",
+            f"Move tasks completed more than {ARCHIVE_AFTER_DAYS} days ago "
+            "to the archive?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No,
+        )
+        if confirmation != QMessageBox.Yes:
+            return
+
+        def archived(count):
             self.update_task_list()
-            QMessageBox.information(self, "Cleared", "All tasks have been deleted.")
+            self.refresh_summaries()
+            QMessageBox.information(self, "Archived", f"Archived {count} tasks.")
+
+        self.worker.submit(archive_completed_tasks, callback=archived)
+
+    def closeEvent(self, event):
+        """Let queued database writes finish before the window goes away"""
+        self.change_timer.stop()
+        self.worker.wait()
+        self.writes.flush()
+        write_snapshot()  # Lets the next launch paint before opening the database
+        self.change_feed.close()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+from datetime import date
+
+from PySide6.QtWidgets import QGroupBox, QListWidget, QVBoxLayout
+
+from backend.database import get_next_tasks
+from frontend.refresh import RefreshTimer
+
+NEXT_UP_COUNT = 5
+PRIORITY_NAMES = {1: "Low", 2: "Medium", 3: "High"}
+
+
+def describe_deadline(deadline, today):
+    if deadline is None:
+        return "no deadline"
+    days = (deadline - today).days
+    if days < 0:
+        return f"{-days} days overdue" if days < -1 else "1 day overdue"
+    if days == 0:
+        return "due today"
+    return "due tomorrow" if days == 1 else f"due in {days} days"
+
+
+class NextUpList(QGroupBox):
+    """
+    The few most urgent pending tasks (`get_next_tasks`). Refreshing runs one
+    small top-K query on `worker` and never touches the main table's rows;
+    `schedule_refresh` coalesces bursts of changes into one refresh.
+    """
+
+    def __init__(self, worker, parent=None):
+        super().__init__("Next up", parent)
+        self.worker = worker
+
+        self.list = QListWidget()
+        self.list.setMaximumHeight(110)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.list)
+
+        self.refresh_timer = RefreshTimer(self.refresh, self)
+        self.schedule_refresh = self.refresh_timer.schedule
+
+    def refresh(self):
+        self.worker.submit(
+            get_next_tasks, NEXT_UP_COUNT, callback=self.show_tasks, key="next"
+        )
+
+    def show_tasks(self, tasks):
+        today = date.today()
+        self.list.clear()
+        self.list.addItems(
+            [
+                f"{task.title}  ({PRIORITY_NAMES.get(task.priority, task.priority)}, "
+                f"{describe_deadline(task.deadline, today)})"
+                for task in tasks
+            ]
+        )
@@ -0,0 +1,19 @@
+from PySide6.QtCore import QTimer
+
+REFRESH_DELAY_MS = 300  # Changes arriving closer together share one query
+
+
+class RefreshTimer(QTimer):
+    """
+    Single-shot timer that calls `refresh` once requests stop arriving for
+    `delay_ms`, so a burst of `schedule()` calls costs one query.
+    """
+
+    def __init__(self, refresh, parent, delay_ms=REFRESH_DELAY_MS):
+        super().__init__(parent)
+        self.setSingleShot(True)
+        self.setInterval(delay_ms)
+        self.timeout.connect(refresh)
+
+    def schedule(self, *_):
+        self.start()
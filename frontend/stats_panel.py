@@ -0,0 +1,71 @@
+from datetime import date
+
+from PySide6.QtWidgets import QGridLayout, QGroupBox, QLabel
+
+from backend.stats import apply_task_changes, get_task_stats
+from frontend.refresh import RefreshTimer
+
+
+class StatsPanel(QGroupBox):
+    """
+    Summary of the task list (counts, completion rate, overdue, next deadlines).
+    `apply_changes` folds the app's own writes into the shown figures without
+    a query. `schedule_refresh`, for changes with no delta at hand (imports,
+    clears, other processes), queues one aggregate query on `worker`; bursts
+    of them are coalesced into a single refresh.
+    """
+
+    def __init__(self, worker, parent=None):
+        super().__init__("Summary", parent)
+        self.worker = worker
+        self.stats = None
+        self.stats_date = None
+        self.refreshing = False
+
+        self.totals_label = QLabel()
+        self.priority_label = QLabel()
+        self.deadlines_label = QLabel()
+        layout = QGridLayout(self)
+        layout.addWidget(self.totals_label, 0, 0)
+        layout.addWidget(self.priority_label, 0, 1)
+        layout.addWidget(self.deadlines_label, 0, 2)
+
+        self.refresh_timer = RefreshTimer(self.refresh, self)
+        self.schedule_refresh = self.refresh_timer.schedule
+
+    def refresh(self):
+        self.refreshing = True
+        self.stats_date = date.today()
+        self.worker.submit(
+            get_task_stats, self.stats_date, callback=self.stats_loaded, key="stats"
+        )
+
+    def stats_loaded(self, stats):
+        self.refreshing = False
+        self.show_stats(stats)
+
+    def apply_changes(self, removed=(), added=()):
+        """Update the figures for a committed write (see `apply_task_changes`)."""
+        if self.stats is None or self.refreshing or self.stats_date != date.today():
+            # A query in flight may or may not have seen this write
+            self.schedule_refresh()
+            return
+        self.show_stats(apply_task_changes(self.stats, removed, added, self.stats_date))
+
+    def show_stats(self, stats):
+        self.stats = stats
+        self.totals_label.setText(
+            f"{stats['total']} tasks, {stats['completed']} completed "
+            f"({stats['completion_rate']:.0%})"
+        )
+        self.priority_label.setText(
+            "   ".join(
+                f"{name}: {stats['by_priority'][priority]['pending']} open"
+                for priority, name in ((3, "High"), (2, "Medium"), (1, "Low"))
+            )
+        )
+        next_due = next((day for day in stats["burndown"] if day["due"]), None)
+        self.deadlines_label.setText(
+            f"{stats['overdue']} overdue, {stats['due_soon']} due this week"
+            + (f", next: {next_due['due']} on {next_due['date']}" if next_due else "")
+        )
@@ -0,0 +1,243 @@
+import time
+from bisect import bisect_left
+from datetime import date, timedelta
+from functools import partial
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QColor
+
+from backend import instrumentation
+from backend.database import DUE_SOON_DAYS, get_tasks_page
+from backend.utils import matches_filters, task_sort_key
+
+HEADERS = ["ID", "Title", "Priority", "Status", "Deadline"]
+
+GREEN = QColor("green")
+ORANGE = QColor("orange")
+RED = QColor("red")
+
+
+class TaskTableModel(QAbstractTableModel):
+    """
+    Table model serving tasks straight from the database.
+    Rows are pulled in chunks through `fetchMore` as the view scrolls, and cell
+    text and colors are only computed when the view asks for a visible cell.
+    Chunks are queried on the `worker` thread and appended when they arrive.
+    """
+
+    def __init__(self, worker, parent=None, chunk_size=200):
+        super().__init__(parent)
+        self.worker = worker
+        self.chunk_size = chunk_size
+        self._generation = 0
+        self._fetching = False
+        self._fetch_started = 0.0
+        self._tasks = []
+        self._by_id = {}
+        self._filters = {}
+        self._order_by = "-priority"
+        self._sort_key = task_sort_key(self._order_by)
+        self._exhausted = True
+        self._today = date.today()
+
+    def set_query(self, filters=None, order_by=None, first_page=None):
+        """
+        Replace the filters/ordering and reload from the first chunk. A
+        `first_page` already at hand (e.g. from a snapshot) is shown instead
+        of querying the database for it.
+        """
+        self.beginResetModel()
+        self._filters = dict(filters or {})
+        if order_by is not None:
+            self._order_by = order_by
+            self._sort_key = task_sort_key(order_by)
+        self._tasks = []
+        self._by_id = {}
+        self._exhausted = False
+        self._fetching = False
+        self._generation += 1  # Chunks still in flight belong to the old query
+        self._today = date.today()
+        self.endResetModel()
+        if first_page is None:
+            self.fetchMore(QModelIndex())
+        else:
+            self._fetch_started = time.perf_counter()
+            self._append_page(self._generation, 0, first_page)
+
+    def refresh(self):
+        """Reload with the current filters and ordering."""
+        self.set_query(self._filters, self._order_by)
+
+    def task_at(self, row):
+        return self._tasks[row]
+
+    def row_of(self, task_id):
+        """Return the row showing `task_id`, or None if it is not loaded."""
+        task = self._by_id.get(task_id)
+        if task is None:
+            return None
+        return bisect_left(self._tasks, self._sort_key(task), key=self._sort_key)
+
+    def insert_task(self, task):
+        """Insert a new task at its sorted position without reloading."""
+        if task.id in self._by_id:  # Already shown, e.g. from the change feed
+            self.update_task(task)
+            return
+        if not matches_filters(task, self._filters):
+            return
+        row = bisect_left(self._tasks, self._sort_key(task), key=self._sort_key)
+        if row == len(self._tasks) and not self._exhausted:
+            return  # Past the loaded rows; a later fetchMore will pick it up
+
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._tasks.insert(row, task)
+        self._by_id[task.id] = task
+        self.endInsertRows()
+
+    def update_task(self, task):
+        """Refresh a changed task in place, moving it if its sort position changed."""
+        row = self.row_of(task.id)
+        if row is None:
+            self.insert_task(task)
+            return
+        if not matches_filters(task, self._filters):
+            self.remove_task(task.id)
+            return
+        if self._sort_key(task) != self._sort_key(self._tasks[row]):
+            self.remove_task(task.id)
+            self.insert_task(task)
+            return
+
+        self._tasks[row] = task
+        self._by_id[task.id] = task
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+
+    def remove_task(self, task_id):
+        """Drop a deleted task's row without reloading."""
+        row = self.row_of(task_id)
+        if row is None:
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._tasks[row]
+        del self._by_id[task_id]
+        self.endRemoveRows()
+
+    def update_tasks(self, tasks):
+        for task in tasks:
+            self.update_task(task)
+
+    def apply_changes(self, changes):
+        """Apply a `ChangeFeed` delta; a reset delta reloads from the database."""
+        if changes.reset:
+            self.refresh()
+            return
+        self.remove_tasks(changes.deleted)
+        self.update_tasks(changes.updated)
+
+    def remove_tasks(self, task_ids):
+        """Drop many rows, removing each contiguous run of rows in one step."""
+        rows = sorted(
+            (row for row in map(self.row_of, task_ids) if row is not None),
+            reverse=True,
+        )
+        while rows:
+            last = first = rows.pop(0)
+            while rows and rows[0] == first - 1:
+                first = rows.pop(0)
+
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for task in self._tasks[first : last + 1]:
+                del self._by_id[task.id]
+            del self._tasks[first : last + 1]
+            self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        task = self._tasks[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(task.id)
+            if column == 1:
+                return task.title
+            if column == 2:
+                return str(task.priority)
+            if column == 3:
+                return "Completed" if task.completed else "Pending"
+            # Deadlines arrive as dates, so there is nothing to parse per row
+            return task.deadline.strftime("%d-%m-%Y") if task.deadline else "N/A"
+
+        if role == Qt.ForegroundRole:
+            if column == 3:
+                return GREEN if task.completed else RED
+            if column == 4:
+                if task.deadline is None:
+                    return None
+                if task.deadline < self._today:
+                    return RED  # Overdue
+                if task.deadline < self._today + timedelta(days=DUE_SOON_DAYS):
+                    return ORANGE  # Due soon
+                return GREEN  # Safe
+
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+
+        self._fetching = True
+        self._fetch_started = time.perf_counter()
+        offset = len(self._tasks)
+        # Keyed so that rapid re-queries collapse into the latest one
+        self.worker.submit(
+            get_tasks_page,
+            self._filters,
+            self._order_by,
+            offset=offset,
+            limit=self.chunk_size,
+            callback=partial(self._append_page, self._generation, offset),
+            key=("tasks_page", id(self)),
+        )
+
+    def _append_page(self, generation, offset, page):
+        if generation != self._generation:
+            return
+        self._fetching = False
+        if offset != len(self._tasks):
+            self.fetchMore(QModelIndex())  # Rows shifted meanwhile; ask again
+            return
+
+        if len(page) < self.chunk_size:
+            self._exhausted = True
+        if not page:
+            return
+
+        first = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._tasks.extend(page)
+        self._by_id.update((task.id, task) for task in page)
+        self.endInsertRows()
+        # From request to rows in the view, including time queued on the worker
+        instrumentation.record(
+            "gui.fetch_page",
+            (time.perf_counter() - self._fetch_started) * 1000,
+            len(page),
+        )
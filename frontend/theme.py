@@ -0,0 +1,191 @@
+"""
+Light and dark styling that follows the platform color scheme.
+
+ThemeManager listens for the change notifications Qt already delivers
+(`QStyleHints.colorSchemeChanged`, palette and theme change events) instead of
+polling. A stylesheet is only set when the resolved theme actually differs
+from the one applied, as every `setStyleSheet` re-polishes the whole window.
+"""
+
+from functools import lru_cache
+from string import Template
+
+from PySide6.QtCore import QEvent, QObject, Qt, Signal
+from PySide6.QtGui import QGuiApplication, QPalette
+
+try:
+    import winreg
+except ImportError:  # Not on Windows
+    winreg = None
+
+DARK = "dark"
+LIGHT = "light"
+
+COLORS = {
+    DARK: {
+        "background": "#2E2E2E",
+        "text": "white",
+        "button": "#444",
+        "button_hover": "#555",
+        "button_pressed": "#666",
+        "border": "#666",
+        "delete": "#D9534F",
+        "delete_hover": "#C9302C",
+        "complete": "#5CB85C",
+        "complete_hover": "#4CAE4C",
+        "table": "#3A3A3A",
+        "grid": "#555",
+        "selection": "#555",
+        "header": "#444",
+        "input": "#3A3A3A",
+        "popup": "#3A3A3A",
+        "focus_background": "#444",
+    },
+    LIGHT: {
+        "background": "#F5F5F5",
+        "text": "black",
+        "button": "#E0E0E0",
+        "button_hover": "#D6D6D6",
+        "button_pressed": "#BDBDBD",
+        "border": "#BDBDBD",
+        "delete": "#FF6B6B",
+        "delete_hover": "#FF3B3B",
+        "complete": "#4CAF50",
+        "complete_hover": "#45A049",
+        "table": "white",
+        "grid": "#CCC",
+        "selection": "#D6D6D6",
+        "header": "#E0E0E0",
+        "input": "#FFFFFF",
+        "popup": "#F5F5F5",
+        "focus_background": "#F0F0F0",
+    },
+}
+
+STYLESHEET = Template(
+    """
+    QWidget { background-color: $background; color: $text; }
+
+    QPushButton {
+        background-color: $button;
+        color: $text;
+        border-radius: 8px;
+        padding: 8px;
+        font-size: 14px;
+        border: 1px solid $border;
+    }
+    QPushButton:hover { background-color: $button_hover; }
+    QPushButton:pressed { background-color: $button_pressed; }
+    QPushButton#delete_task_button { background-color: $delete; }
+    QPushButton#delete_task_button:hover { background-color: $delete_hover; }
+    QPushButton#complete_task_button { background-color: $complete; }
+    QPushButton#complete_task_button:hover { background-color: $complete_hover; }
+
+    QTableView {
+        background-color: $table;
+        color: $text;
+        gridline-color: $grid;
+        selection-background-color: $selection;
+    }
+    QHeaderView::section {
+        background-color: $header;
+        padding: 5px;
+        font-weight: bold;
+        border: 1px solid $border;
+    }
+
+    QComboBox, QDateEdit, QLineEdit {
+        background-color: $input;
+        color: $text;
+        border-radius: 6px;
+        padding: 6px;
+        border: 1px solid $border;
+        font-size: 14px;
+    }
+    QComboBox:hover, QDateEdit:hover, QLineEdit:hover { border: 1px solid #888; }
+    QComboBox QAbstractItemView {
+        background-color: $popup;
+        selection-background-color: $selection;
+        border-radius: 6px;
+    }
+    QLineEdit:focus {
+        border: 2px solid #1DB954;
+        background-color: $focus_background;
+    }
+    """
+)
+
+
+@lru_cache(maxsize=None)
+def stylesheet(theme):
+    """The application stylesheet for `theme`, built once per theme."""
+    return STYLESHEET.substitute(COLORS[theme])
+
+
+def windows_dark_mode():
+    """Read the Windows "apps use light theme" setting; None where unavailable."""
+    if winreg is None:
+        return None
+    try:
+        key = winreg.OpenKey(
+            winreg.HKEY_CURRENT_USER,
+            r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize",
+        )
+        with key:
+            value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
+        return value == 0
+    except OSError:
+        return None
+
+
+def system_theme():
+    """Resolve the platform's current color scheme to DARK or LIGHT."""
+    app = QGuiApplication.instance()
+    scheme = app.styleHints().colorScheme()
+    if scheme == Qt.ColorScheme.Dark:
+        return DARK
+    if scheme == Qt.ColorScheme.Light:
+        return LIGHT
+
+    # Platform plugin does not report a scheme: ask Windows, else judge the palette
+    dark = windows_dark_mode()
+    if dark is None:
+        dark = app.palette().color(QPalette.Window).lightness() < 128
+    return DARK if dark else LIGHT
+
+
+class ThemeManager(QObject):
+    """Keeps `window` styled for the platform's light/dark setting."""
+
+    themeChanged = Signal(str)
+
+    # Events a top-level window receives when the platform theme or palette changes
+    WATCHED_EVENTS = (QEvent.ThemeChange, QEvent.ApplicationPaletteChange)
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self.theme = None
+        QGuiApplication.instance().styleHints().colorSchemeChanged.connect(
+            self.update_theme
+        )
+        window.installEventFilter(self)
+        self.update_theme()
+
+    @property
+    def dark_mode(self):
+        return self.theme == DARK
+
+    def eventFilter(self, watched, event):
+        if event.type() in self.WATCHED_EVENTS:
+            self.update_theme()
+        return False
+
+    def update_theme(self, *_):
+        """Re-style the window if the platform theme differs from the applied one."""
+        theme = system_theme()
+        if theme == self.theme:
+            return
+        self.theme = theme
+        self.window.setStyleSheet(stylesheet(theme))
+        self.themeChanged.emit(theme)
@@ -0,0 +1,112 @@
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _Job(QRunnable):
+    """One queued call; its target can be swapped until it starts running."""
+
+    def __init__(self, worker, key, func, args, kwargs, callback, error_callback):
+        super().__init__()
+        self.setAutoDelete(False)  # The worker keeps it until results are delivered
+        self.worker = worker
+        self.key = key
+        self.started = False
+        self.spec = (func, args, kwargs, callback, error_callback)
+
+    def run(self):
+        with self.worker._lock:
+            self.started = True
+            if self.worker._queued.get(self.key) is self:
+                del self.worker._queued[self.key]
+            func, args, kwargs, callback, error_callback = self.spec
+
+        try:
+            if self.worker.writes is not None:
+                self.worker.writes.flush()  # Read-your-writes for queued edits
+            result = func(*args, **kwargs)
+        except Exception as error:
+            self.worker._done.emit(self, None, error, callback, error_callback)
+        else:
+            self.worker._done.emit(self, result, None, callback, error_callback)
+
+
+class DatabaseWorker(QObject):
+    """
+    Runs backend calls off the GUI thread and hands results back on it.
+
+    Jobs run one at a time in submission order on a private thread, so writes
+    and the reads that follow them never race. Jobs submitted with a `key`
+    are coalesced: while a job with that key is still waiting to start, a new
+    submission replaces it instead of queueing another query.
+    Sessions come from the thread-local `SessionLocal`, so the worker thread
+    always uses its own.
+    With a `writes` queue (backend.database.WriteBehindQueue), every job
+    first flushes it, so jobs still see edits made through `watch`ed Futures.
+    """
+
+    failed = Signal(str)
+    _done = Signal(object, object, object, object, object)
+    _relay = Signal(object, object)
+
+    def __init__(self, parent=None, writes=None):
+        super().__init__(parent)
+        self.writes = writes
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._queued = {}
+        self._jobs = set()
+        self._done.connect(self._deliver)
+        self._relay.connect(lambda func, args: func(*args))
+
+    def submit(
+        self, func, *args, callback=None, error_callback=None, key=None, **kwargs
+    ):
+        """
+        Run `func(*args, **kwargs)` in the background. `callback(result)` or
+        `error_callback(error)` is then called on the GUI thread; errors
+        without an `error_callback` are reported through `failed`.
+        """
+        spec = (func, args, kwargs, callback, error_callback)
+        if key is not None:
+            with self._lock:
+                queued = self._queued.get(key)
+                if queued is not None and not queued.started:
+                    queued.spec = spec
+                    return
+
+        job = _Job(self, key, *spec)
+        if key is not None:
+            with self._lock:
+                self._queued[key] = job
+        self._jobs.add(job)
+        self.pool.start(job)
+
+    def watch(self, future, callback=None, error_callback=None):
+        """Deliver the outcome of a queued write like a job's, on the GUI thread."""
+
+        def done(future):
+            error = future.exception()
+            result = None if error else future.result()
+            self._done.emit(None, result, error, callback, error_callback)
+
+        future.add_done_callback(done)
+
+    def relay(self, func):
+        """Wrap `func` so that calling it from a job runs it on the GUI thread."""
+        return lambda *args: self._relay.emit(func, args)
+
+    def wait(self, msecs=-1):
+        """Block until every submitted job has run; results arrive via the event loop."""
+        self.pool.waitForDone(msecs)
+
+    def _deliver(self, job, result, error, callback, error_callback):
+        self._jobs.discard(job)
+        if error is not None:
+            if error_callback:
+                error_callback(error)
+            else:
+                self.failed.emit(str(error))
+        elif callback:
+            callback(result)
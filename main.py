@@ -0,0 +1,294 @@
+"""
+Command line interface for the To-Do List Manager.
+
+Usage examples:
+    python main.py add "Buy milk" --priority 2 --deadline 2025-03-01
+    python main.py list --pending --sort -priority
+    python main.py list --overdue --sort deadline
+    python main.py next -k 3
+    python main.py complete 3 4 5
+    python main.py export tasks.ndjson
+    python main.py archive --older-than 30
+    python main.py serve --port 8765
+    printf 'add "Call Bob"\\ncomplete 7\\n' | python main.py batch
+
+This module never imports Qt, and SQLAlchemy (via `backend`) is only imported
+once a command actually needs the database, so `--help` and argument errors
+stay at bare interpreter startup cost. Scripts issuing many commands should
+pipe them through `batch`, which pays the database import once.
+"""
+
+import argparse
+import datetime
+import json
+import shlex
+import sys
+
+
+def _backend():
+    """Import the database layer on first use; it pulls in SQLAlchemy."""
+    from backend import database
+
+    return database
+
+
+def cmd_add(args):
+    task = _backend().add_task(args.title, args.priority, args.deadline)
+    print(task.id)
+    return 0
+
+
+def cmd_list(args):
+    database = _backend()
+    filters = {"completed": args.completed, "priority": args.priority}
+    if args.due == "overdue":
+        filters.update(database.overdue_filters())
+    elif args.due == "soon":
+        filters.update(database.due_soon_filters())
+    if args.search:
+        filters["search"] = args.search
+    if args.archived:
+        filters["include_archived"] = True
+    tasks = database.get_tasks_page(filters, args.sort, args.offset, args.limit)
+
+    from backend.utils import format_tasks, task_to_dict
+
+    if args.json:
+        for task in tasks:
+            print(json.dumps(task_to_dict(task), ensure_ascii=False))
+    else:
+        for line in format_tasks(tasks):
+            print(line)
+    return 0
+
+
+def cmd_next(args):
+    tasks = _backend().get_next_tasks(args.count)
+
+    from backend.utils import format_tasks, task_to_dict
+
+    if args.json:
+        for task in tasks:
+            print(json.dumps(task_to_dict(task), ensure_ascii=False))
+    else:
+        for line in format_tasks(tasks):
+            print(line)
+    return 0
+
+
+def cmd_complete(args):
+    updated = {task.id for task in _backend().mark_tasks_complete(args.ids)}
+    return _report_missing(args.ids, updated)
+
+
+def cmd_delete(args):
+    deleted = set(_backend().delete_tasks(args.ids))
+    return _report_missing(args.ids, deleted)
+
+
+def _report_missing(requested, found):
+    missing = [task_id for task_id in requested if task_id not in found]
+    for task_id in missing:
+        print(f"No task with id {task_id}", file=sys.stderr)
+    return 1 if missing else 0
+
+
+def cmd_export(args):
+    from backend.transfer import export_tasks_ndjson
+
+    count = export_tasks_ndjson(args.file, include_archived=args.include_archived)
+    print(f"Exported {count} tasks to {args.file}", file=sys.stderr)
+    return 0
+
+
+def cmd_import(args):
+    from backend.transfer import import_tasks
+
+    result = import_tasks(args.file)
+    print(
+        f"Imported {result.added} new tasks and updated {result.updated} "
+        f"from {args.file}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def cmd_archive(args):
+    archived = _backend().archive_completed_tasks(args.older_than)
+    print(f"Archived {archived} completed tasks", file=sys.stderr)
+    return 0
+
+
+def cmd_stats(args):
+    from backend.stats import get_task_stats
+
+    stats = get_task_stats()
+    if args.json:
+        print(json.dumps(stats))
+        return 0
+
+    print(
+        f"Total: {stats['total']}  Completed: {stats['completed']}  "
+        f"Pending: {stats['pending']}  ({stats['completion_rate']:.0%} done)"
+    )
+    print(f"Overdue: {stats['overdue']}  Due soon: {stats['due_soon']}")
+    for priority, counts in stats["by_priority"].items():
+        print(
+            f"Priority {priority}: {counts['total']} "
+            f"({counts['completed']} completed, {counts['pending']} pending)"
+        )
+    print("Burndown (date, due, remaining):")
+    for day in stats["burndown"]:
+        print(f"  {day['date']}  {day['due']:>5}  {day['remaining']:>6}")
+    return 0
+
+
+def cmd_serve(args):
+    from backend.server import main as serve
+
+    serve(["--host", args.host, "--port", str(args.port)])
+    return 0
+
+
+def cmd_batch(args):
+    """Run one command per input line in this process."""
+    status = 0
+    for line in args.file:
+        argv = shlex.split(line, comments=True)
+        if not argv:
+            continue
+        if argv[0] == "batch":
+            print("batch cannot be nested", file=sys.stderr)
+            status = 2
+            continue
+        try:
+            status = run(argv) or status
+        except SystemExit as error:  # argparse rejected the line
+            status = error.code or status
+    return status
+
+
+def _date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, use YYYY-MM-DD")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="Manage the to-do list from the command line."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a task and print its id")
+    add.add_argument("title")
+    add.add_argument("-p", "--priority", type=int, choices=(1, 2, 3), default=1)
+    add.add_argument("-d", "--deadline", type=_date, help="due date as YYYY-MM-DD")
+    add.set_defaults(handler=cmd_add)
+
+    listing = commands.add_parser("list", help="list tasks")
+    status = listing.add_mutually_exclusive_group()
+    status.add_argument("--completed", action="store_const", const=True)
+    status.add_argument(
+        "--pending", dest="completed", action="store_const", const=False
+    )
+    listing.add_argument("-p", "--priority", type=int, choices=(1, 2, 3))
+    due = listing.add_mutually_exclusive_group()
+    due.add_argument(
+        "--overdue",
+        dest="due",
+        action="store_const",
+        const="overdue",
+        help="pending tasks past their deadline",
+    )
+    due.add_argument(
+        "--due-soon",
+        dest="due",
+        action="store_const",
+        const="soon",
+        help="pending tasks due in the next 7 days",
+    )
+    listing.add_argument("-s", "--search", help="match title words by prefix")
+    listing.add_argument(
+        "--sort", default="-priority", help="column to sort by, '-' for descending"
+    )
+    listing.add_argument("--offset", type=int, default=0)
+    listing.add_argument("--limit", type=int)
+    listing.add_argument(
+        "--archived", action="store_true", help="include archived tasks"
+    )
+    listing.add_argument("--json", action="store_true", help="print NDJSON")
+    listing.set_defaults(handler=cmd_list)
+
+    next_up = commands.add_parser(
+        "next", help="list the most urgent pending tasks by priority and deadline"
+    )
+    next_up.add_argument("-k", "--count", type=int, default=5)
+    next_up.add_argument("--json", action="store_true", help="print NDJSON")
+    next_up.set_defaults(handler=cmd_next)
+
+    complete = commands.add_parser("complete", help="mark tasks as completed")
+    complete.add_argument("ids", type=int, nargs="+")
+    complete.set_defaults(handler=cmd_complete)
+
+    delete = commands.add_parser("delete", help="delete tasks")
+    delete.add_argument("ids", type=int, nargs="+")
+    delete.set_defaults(handler=cmd_delete)
+
+    export = commands.add_parser("export", help="export all tasks as NDJSON")
+    export.add_argument("file", nargs="?", default="tasks.ndjson")
+    export.add_argument("--include-archived", action="store_true")
+    export.set_defaults(handler=cmd_export)
+
+    importing = commands.add_parser("import", help="import tasks from an export")
+    importing.add_argument("file", nargs="?", default="tasks.ndjson")
+    importing.set_defaults(handler=cmd_import)
+
+    archive = commands.add_parser(
+        "archive", help="move old completed tasks to the archive"
+    )
+    archive.add_argument(
+        "--older-than",
+        type=int,
+        default=30,
+        metavar="DAYS",
+        help="archive tasks completed more than DAYS days ago (default 30)",
+    )
+    archive.set_defaults(handler=cmd_archive)
+
+    stats = commands.add_parser(
+        "stats", help="show task counts, overdue tasks and a deadline burndown"
+    )
+    stats.add_argument("--json", action="store_true")
+    stats.set_defaults(handler=cmd_stats)
+
+    serve = commands.add_parser("serve", help="serve the tasks over HTTP")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.set_defaults(handler=cmd_serve)
+
+    batch = commands.add_parser(
+        "batch", help="run commands read one per line from a file or stdin"
+    )
+    batch.add_argument(
+        "file", nargs="?", type=argparse.FileType("r"), default=sys.stdin
+    )
+    batch.set_defaults(handler=cmd_batch)
+
+    return parser
+
+
+def run(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (ValueError, OSError) as error:
+        # e.g. an unknown sort column or a missing import file; in batch mode
+        # the remaining lines still run
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,16 @@
+import os
+
+# Every test gets a private in-memory database: set before backend is imported
+os.environ["TODO_STORAGE"] = "memory"
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def repository():
+    from backend.repository import get_repository
+
+    repository = get_repository()
+    repository.clear_all_tasks()
+    yield repository
+    repository.clear_all_tasks()
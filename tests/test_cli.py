@@ -0,0 +1,18 @@
+import io
+
+import main
+
+
+def test_bad_sort_is_reported_not_raised(repository, capsys):
+    assert main.run(["list", "--sort", "bogus"]) == 1
+    assert capsys.readouterr().err.startswith("error: Cannot order tasks by")
+
+
+def test_batch_keeps_going_after_a_failed_line(
+    repository, tmp_path, monkeypatch, capsys
+):
+    lines = f'import {tmp_path / "missing.ndjson"}\nadd "Buy milk"\n'
+    monkeypatch.setattr("sys.stdin", io.StringIO(lines))
+    assert main.run(["batch"]) == 1
+    assert "error: [Errno 2]" in capsys.readouterr().err
+    assert [task.title for task in repository.get_tasks_page()] == ["Buy milk"]
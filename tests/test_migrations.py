@@ -0,0 +1,175 @@
+import sqlite3
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+
+from backend import migrations
+from backend.models import task_hash
+
+# tasks as created by the first releases, which stored deadlines as free text
+BASELINE_SCHEMA = """CREATE TABLE tasks (
+    id INTEGER NOT NULL,
+    title VARCHAR NOT NULL,
+    priority INTEGER,
+    completed BOOLEAN,
+    deadline VARCHAR,
+    PRIMARY KEY (id)
+)"""
+
+BASELINE_ROWS = [
+    (1, "Write report", 3, 0, "2024-12-25"),
+    (2, "Pay rent", 2, 1, "01-02-2025"),  # DD-MM-YYYY from old JSON saves
+    (3, "Call mom", 1, 0, "next tuesday"),  # Unreadable
+    (4, "Write report", 1, 0, "25-12-2024"),  # Duplicate of 1 once normalized
+    (5, "Buy milk", 1, 0, None),
+    (6, "Buy milk", 2, 1, ""),  # Duplicate of 5: no deadline either
+]
+
+
+def make_database(path, schema=BASELINE_SCHEMA, rows=BASELINE_ROWS):
+    connection = sqlite3.connect(path)
+    connection.execute(schema)
+    placeholders = ", ".join("?" * len(rows[0]))
+    connection.executemany(f"INSERT INTO tasks VALUES ({placeholders})", rows)
+    connection.commit()
+    connection.close()
+
+
+def migrate(path):
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        migrations.migrate(engine)
+    finally:
+        engine.dispose()
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+@pytest.fixture
+def migrated(tmp_path):
+    path = tmp_path / "tasks.db"
+    make_database(path)
+    connection = migrate(path)
+    yield connection
+    connection.close()
+
+
+def columns(connection):
+    return [row["name"] for row in connection.execute("PRAGMA table_info(tasks)")]
+
+
+def rows_by_id(connection):
+    return {row["id"]: row for row in connection.execute("SELECT * FROM tasks")}
+
+
+def test_baseline_is_upgraded_to_latest_version(migrated):
+    assert migrations.schema_version(migrated) == len(migrations.MIGRATIONS)
+    assert columns(migrated) == [
+        "id",
+        "title",
+        "priority",
+        "completed",
+        "deadline",
+        "completed_at",
+        "content_hash",
+    ]
+    schema = migrated.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'tasks'"
+    ).fetchone()[0]
+    assert "deadline DATE" in schema
+    assert "AUTOINCREMENT" in schema
+
+
+def test_every_row_survives_with_its_values(migrated):
+    rows = rows_by_id(migrated)
+    assert sorted(rows) == [1, 2, 3, 4, 5, 6]
+    for task_id, title, priority, completed, _ in BASELINE_ROWS:
+        assert rows[task_id]["title"] == title
+        assert rows[task_id]["priority"] == priority
+        assert rows[task_id]["completed"] == completed
+
+
+def test_deadlines_are_normalized(migrated):
+    deadlines = {
+        task_id: row["deadline"] for task_id, row in rows_by_id(migrated).items()
+    }
+    assert deadlines == {
+        1: "2024-12-25",
+        2: "2025-02-01",
+        3: None,
+        4: "2024-12-25",
+        5: None,
+        6: None,
+    }
+
+
+def test_completed_tasks_get_a_completion_time(migrated):
+    rows = rows_by_id(migrated)
+    assert rows[2]["completed_at"] is not None
+    assert rows[6]["completed_at"] is not None
+    assert all(rows[task_id]["completed_at"] is None for task_id in (1, 3, 4, 5))
+
+
+def test_duplicates_get_salted_hashes(migrated):
+    rows = rows_by_id(migrated)
+    report = date(2024, 12, 25)
+    assert rows[1]["content_hash"] == task_hash("Write report", report)
+    assert rows[4]["content_hash"] == task_hash("Write report", report, salt=4)
+    assert rows[5]["content_hash"] == task_hash("Buy milk")
+    assert rows[6]["content_hash"] == task_hash("Buy milk", salt=6)
+    hashes = [row["content_hash"] for row in rows.values()]
+    assert len(set(hashes)) == len(hashes)  # Room for the unique index
+
+
+def test_database_without_deadline_column(tmp_path):
+    path = tmp_path / "tasks.db"
+    make_database(
+        path,
+        schema="CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, "
+        "priority INTEGER, completed BOOLEAN)",
+        rows=[(1, "Old task", 2, 0)],
+    )
+    connection = migrate(path)
+    row = connection.execute("SELECT * FROM tasks").fetchone()
+    assert (row["title"], row["deadline"]) == ("Old task", None)
+    assert row["content_hash"] == task_hash("Old task")
+    connection.close()
+
+
+def test_migrating_twice_changes_nothing(migrated):
+    before = [tuple(row) for row in migrated.execute("SELECT * FROM tasks")]
+    path = migrated.execute("PRAGMA database_list").fetchone()["file"]
+    migrated.close()
+    again = migrate(path)
+    assert [tuple(row) for row in again.execute("SELECT * FROM tasks")] == before
+    again.close()
+
+
+def test_failed_step_leaves_the_file_untouched(tmp_path, monkeypatch):
+    path = tmp_path / "tasks.db"
+    make_database(path)
+
+    def broken(connection):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", [*migrations.MIGRATIONS, broken])
+    with pytest.raises(RuntimeError):
+        migrate(path)
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == 0
+    assert connection.execute("SELECT deadline FROM tasks WHERE id = 2").fetchone() == (
+        "01-02-2025",
+    )
+    connection.close()
+
+
+def test_new_database_is_only_stamped(tmp_path):
+    path = tmp_path / "tasks.db"
+    sqlite3.connect(path).close()
+    connection = migrate(path)
+    assert migrations.schema_version(connection) == len(migrations.MIGRATIONS)
+    assert connection.execute("SELECT count(*) FROM sqlite_master").fetchone()[0] == 0
+    connection.close()
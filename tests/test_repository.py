@@ -0,0 +1,198 @@
+import threading
+from datetime import date, timedelta
+
+from backend import config, database
+from backend.database import TaskRecord
+from backend.stats import apply_task_changes
+from backend.transfer import export_tasks_ndjson, import_tasks
+
+TODAY = date(2025, 3, 1)
+
+
+def add_some(repository):
+    return [
+        repository.add_task("Write report", 3, TODAY + timedelta(days=2)),
+        repository.add_task("Pay rent", 2, TODAY - timedelta(days=1)),
+        repository.add_task("Buy milk", 1),
+    ]
+
+
+def test_runs_on_memory_storage():
+    assert database.storage_config.storage == config.MEMORY
+
+
+def test_add_and_read_back(repository):
+    report, rent, milk = add_some(repository)
+    assert isinstance(report, TaskRecord)
+    assert repository.get_task(report.id) == report
+    assert repository.get_task(report.id + 1000) is None
+    page = repository.get_tasks_page(order_by="-priority", limit=2)
+    assert [task.title for task in page] == ["Write report", "Pay rent"]
+    assert repository.count_tasks() == 3
+    assert repository.count_tasks({"priority": 1}) == 1
+    assert [task.id for task in repository.search_tasks("milk")] == [milk.id]
+
+
+def test_adding_a_duplicate_creates_a_new_task(repository):
+    first = repository.add_task("Buy milk", 1, TODAY)
+    second = repository.add_task("Buy milk", 1, TODAY)
+    assert second.id != first.id
+    assert repository.count_tasks() == 2
+
+
+def test_bulk_add_returns_one_id_per_task_in_order(repository):
+    repository.add_task("b", 2)
+    ids = database.add_tasks_bulk(
+        [{"title": title, "priority": 2} for title in ("a", "b", "c", "b")]
+    )
+    assert len(ids) == len(set(ids)) == 4
+    assert [repository.get_task(task_id).title for task_id in ids] == [
+        "a",
+        "b",
+        "c",
+        "b",
+    ]
+
+
+def test_merge_adds_new_tasks_and_updates_matches(repository):
+    add_some(repository)
+    added, updated = repository.merge_tasks(
+        [
+            {"title": "Buy milk", "priority": 3, "completed": True},
+            {"title": "Walk dog", "priority": 1},
+        ]
+    )
+    assert (added, updated) == (1, 1)
+    assert repository.merge_tasks([{"title": "Walk dog", "priority": 1}]) == (0, 0)
+    (milk,) = repository.get_tasks_page({"search": "milk"})
+    assert (milk.priority, milk.completed) == (3, True)
+    assert milk.completed_at is not None
+
+
+def test_complete_and_delete(repository):
+    report, rent, milk = add_some(repository)
+    assert repository.mark_task_complete(report.id).completed
+    assert repository.mark_task_complete(report.id + 1000) is None
+    assert [task.id for task in repository.mark_tasks_complete([rent.id])] == [rent.id]
+    assert repository.delete_task(milk.id)
+    assert not repository.delete_task(milk.id)
+    assert repository.delete_tasks([report.id, rent.id]) == [report.id, rent.id]
+    assert repository.count_tasks() == 0
+
+
+def test_next_tasks_match_a_full_sort(repository):
+    for i in range(60):
+        deadline = TODAY + timedelta(days=i % 45 - 15) if i % 4 else None
+        repository.add_task(f"task {i}", i % 3 + 1, deadline)
+    repository.mark_tasks_complete(range(1, 200, 7))
+    pending = repository.get_tasks_page({"completed": False})
+    expected = sorted(
+        (database.urgency(task, TODAY) for task in pending), reverse=True
+    )[:8]
+    next_tasks = repository.get_next_tasks(8, TODAY)
+    assert [database.urgency(task, TODAY) for task in next_tasks] == expected
+    assert all(not task.completed for task in next_tasks)
+
+
+def test_stats_deltas_match_a_recount(repository):
+    report, rent, milk = add_some(repository)
+    stats = repository.get_task_stats(TODAY)
+
+    added = repository.add_task("Dentist", 2, TODAY + timedelta(days=5))
+    stats = apply_task_changes(stats, added=[added], today=TODAY)
+    completed = repository.mark_task_complete(rent.id)
+    stats = apply_task_changes(stats, removed=[rent], added=[completed], today=TODAY)
+    repository.delete_task(report.id)
+    stats = apply_task_changes(stats, removed=[report], today=TODAY)
+
+    assert stats == repository.get_task_stats(TODAY)
+
+
+def test_version_changes_on_every_write(repository):
+    versions = [repository.version()]
+    task = repository.add_task("Buy milk", 1)
+    versions.append(repository.version())
+    repository.mark_task_complete(task.id)
+    versions.append(repository.version())
+    repository.delete_task(task.id)
+    versions.append(repository.version())
+    assert len(set(versions)) == len(versions)
+
+
+def test_threads_share_one_database(repository):
+    errors = []
+
+    def add_tasks(worker):
+        try:
+            for i in range(25):
+                repository.add_task(f"worker {worker} task {i}", 2)
+                repository.count_tasks()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=add_tasks, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert repository.count_tasks() == 200
+
+
+def test_reimporting_an_export_with_duplicates_changes_nothing(repository, tmp_path):
+    first = repository.add_task("Buy milk", 2, TODAY)
+    repository.add_task("Buy milk", 3, TODAY)
+    repository.mark_task_complete(first.id)
+    before = repository.get_tasks_page()
+    export_file = tmp_path / "tasks.ndjson"
+    export_tasks_ndjson(export_file)
+
+    assert import_tasks(export_file) == (0, 0)
+    assert repository.get_tasks_page() == before
+
+    repository.clear_all_tasks()
+    assert import_tasks(export_file) == (2, 0)
+    assert sorted(
+        (task.priority, task.completed) for task in repository.get_tasks_page()
+    ) == [(2, True), (3, False)]
+    assert import_tasks(export_file) == (0, 0)
+
+
+def test_files_without_hashes_match_by_title_and_deadline(repository, tmp_path):
+    repository.add_task("Buy milk", 2, TODAY)
+    legacy_file = tmp_path / "tasks.ndjson"
+    legacy_file.write_text(
+        '{"title": "Buy milk", "priority": 3, "deadline": "2025-03-01"}\n'
+        '{"title": "Walk dog", "priority": 1}\n'
+    )
+    assert import_tasks(legacy_file) == (1, 1)
+    tasks = repository.get_tasks_page(order_by="id")
+    assert [(task.title, task.priority) for task in tasks] == [
+        ("Buy milk", 3),
+        ("Walk dog", 1),
+    ]
+
+
+def test_one_id_per_added_task(repository):
+    ids = [repository.add_task(title, 1).id for title in ("a", "a", "b")]
+    assert ids == [ids[0], ids[0] + 1, ids[0] + 2]
+
+
+def test_next_tasks_include_imported_priorities_outside_1_to_3(repository):
+    database.add_tasks_bulk(
+        [
+            {"title": "No priority", "priority": None, "deadline": "2020-01-01"},
+            {"title": "Priority 5", "priority": 5, "deadline": "2025-03-10"},
+            {"title": "Priority 0", "priority": 0},
+        ]
+    )
+    add_some(repository)
+    next_tasks = repository.get_next_tasks(5, TODAY)
+    assert [task.title for task in next_tasks[:2]] == ["No priority", "Priority 5"]
+    assert [database.urgency(task, TODAY) for task in next_tasks] == sorted(
+        (
+            database.urgency(task, TODAY)
+            for task in repository.get_tasks_page({"completed": False})
+        ),
+        reverse=True,
+    )[:5]